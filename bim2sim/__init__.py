@@ -1,9 +1,14 @@
 """bim2sim library"""
+from __future__ import annotations
+
+import importlib
 from importlib.metadata import version
+from typing import TYPE_CHECKING
 
-from bim2sim.kernel.decision.console import ConsoleDecisionHandler
-from bim2sim.kernel.decision.decisionhandler import DecisionHandler
-from bim2sim.project import Project
+if TYPE_CHECKING:
+    from bim2sim.kernel.decision.console import ConsoleDecisionHandler
+    from bim2sim.kernel.decision.decisionhandler import DecisionHandler
+    from bim2sim.project import Project
 
 
 try:
@@ -11,6 +16,25 @@ try:
 except Exception:
     __version__ = "unknown"
 
+# public API which is imported on first access to keep `import bim2sim` cheap
+_LAZY_IMPORTS = {
+    'ConsoleDecisionHandler': 'bim2sim.kernel.decision.console',
+    'DecisionHandler': 'bim2sim.kernel.decision.decisionhandler',
+    'Project': 'bim2sim.project',
+}
+
+
+def __getattr__(name: str):
+    """Import public API lazily (PEP 562)."""
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 def run_project(project: Project, handler: DecisionHandler):
     """Run project using decision handler."""
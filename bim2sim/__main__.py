@@ -17,27 +17,17 @@ Options:
     -i <source> --ifc <source>  Path to ifc file
     -o --open           Open config file
 """
-from importlib.metadata import version
-
 import docopt
 
-from bim2sim import run_project
+from bim2sim import run_project, __version__
 from bim2sim.project import Project, FolderStructure
 from bim2sim.kernel.decision.console import ConsoleDecisionHandler
 
 
-def get_version():
-    """Get package version"""
-    try:
-        return version("bim2sim")
-    except Exception:
-        return "unknown"
-
-
 def commandline_interface():
     """user interface"""
 
-    args = docopt.docopt(__doc__, version=get_version())
+    args = docopt.docopt(__doc__, version=__version__)
 
     # arguments
     project = args.get('project')
@@ -64,4 +54,5 @@ def commandline_interface():
         exit()
 
 
-commandline_interface()
+if __name__ == '__main__':
+    commandline_interface()
@@ -17,6 +17,9 @@ class AggregationMixin:
     aggregatable_classes: Set['ProductBased'] = set()
 
     def __init__(self, elements: Sequence['ProductBased'], *args, **kwargs):
+        # materialize views, sets and generators once to allow indexing and
+        # repeated iteration
+        elements = list(elements)
         if self.aggregatable_classes:
             received = {type(ele) for ele in elements}
             mismatch = received - self.aggregatable_classes
@@ -1,4 +1,4 @@
-import math
+from collections import Counter
 from functools import partial
 from typing import List, Iterable, Dict, Union, Tuple, Optional
 
@@ -21,10 +21,11 @@ def verify_edge_ports(func):
 
     def wrapper(agg_instance, *args, **kwargs):
         ports = func(agg_instance, *args, **kwargs)
+        elements = set(agg_instance.elements)
         for port in ports:
             if not port.connection:
                 continue
-            if port.connection.parent in agg_instance.elements:
+            if port.connection.parent in elements:
                 raise AssertionError("%s (%s) is not an edge port of %s" % (
                     port, port.guid, agg_instance))
         return ports
@@ -32,6 +33,34 @@ def verify_edge_ports(func):
     return wrapper
 
 
+def length_weighted_diameter(lengths_diameters: list) -> tuple:
+    """Sum up lengths and average diameters weighted by length.
+
+    The magnitudes are summed in the units of the first pair, so quantity
+    arithmetic is only done once instead of once per element.
+
+    Args:
+        lengths_diameters: list of tuples of length and diameter quantities
+
+    Returns:
+        total_length: sum of all lengths, 0 if no lengths are given
+        avg_diameter: average diameter weighted by length, 0 if the total
+            length is 0
+    """
+    if not lengths_diameters:
+        return 0, 0
+    length_unit = lengths_diameters[0][0].u
+    diameter_unit = lengths_diameters[0][1].u
+    magnitudes = np.array([
+        (length.m_as(length_unit), diameter.m_as(diameter_unit))
+        for length, diameter in lengths_diameters])
+    total_length = magnitudes[:, 0].sum()
+    if total_length == 0:
+        return total_length * length_unit, 0
+    avg_diameter = magnitudes.prod(axis=1).sum() / total_length
+    return total_length * length_unit, avg_diameter * diameter_unit
+
+
 class HVACAggregationPort(HVACPort):
     """Port for Aggregation"""
     guid_prefix = 'AggPort'
@@ -104,22 +133,22 @@ class HVACAggregationMixin(AggregationMixin):
         Returns:
             A list of HVACPort objects representing the edge ports.
         """
-        # edges of g excluding all relations to s
-        e1 = base_graph.subgraph(base_graph.nodes - match_graph.nodes).edges
-
-        # if graph and match_graph are identical
-        if not e1:
+        # if graph and match_graph are identical, i.e. there are no edges of
+        # the base graph without relation to the match graph
+        if not any(u not in match_graph and v not in match_graph
+                   for u, v in base_graph.edges):
             # ports with only one connection are edge ports in this case
             edge_ports = [v for v, d in match_graph.degree() if d == 1]
         else:
-            # all edges related to s
-            e2 = base_graph.edges - e1
-            # related to s but not s exclusive
-            e3 = e2 - match_graph.edges
-            # get only edge_ports that belong to the match_graph graph
-            edge_ports = list(
-                set([port for port in [e for x in list(e3) for e in x]
-                     if port in match_graph]))
+            # ports of match_graph with edges in base_graph which are not
+            # part of match_graph, found by checking only the neighbors of the
+            # match instead of building edge sets of the whole base graph
+            base_adjacency = base_graph.adj
+            edge_ports = list({
+                port for port in match_graph
+                for neighbor in base_adjacency.get(port, ())
+                if neighbor not in match_graph
+                or not match_graph.has_edge(port, neighbor)})
         ports = [HVACAggregationPort(port, parent=self) for port in edge_ports]
         return ports
 
@@ -135,12 +164,15 @@ class HVACAggregationMixin(AggregationMixin):
                 None as keys.
             connections: connection list of outer connections.
         """
+        elements = list(elements)
+        # set only for membership tests, ports keep the order of elements
+        element_set = set(elements)
         ports = [port for element in elements for port in element.ports]
         mapping = {port: None for port in ports}
         # TODO: len > 1, optimize
         external_ports = []
         for port in ports:
-            if port.connection and port.connection.parent not in elements:
+            if port.connection and port.connection.parent not in element_set:
                 external_ports.append(port.connection)
 
         mapping[external_ports[0].connection] = external_ports[1]
@@ -152,8 +184,8 @@ class HVACAggregationMixin(AggregationMixin):
     def get_replacement_mapping(self) \
             -> Dict[HVACPort, Union[HVACAggregationPort, None]]:
         """ Get replacement dict for existing ports."""
-        mapping = {port: None for element in self.elements
-                   for port in element.ports}
+        mapping = dict.fromkeys(
+            port for element in self.elements for port in element.ports)
         for port in self.ports:
             for original in port.originals:
                 mapping[original] = port
@@ -233,22 +265,17 @@ class PipeStrand(HVACAggregationMixin, hvac.Pipe):
             elements.
          """
 
-        total_length = 0
-        avg_diameter = 0
-        diameter_times_length = 0
-
+        lengths_diameters = []
         for pipe in self.elements:
-            length = getattr(pipe, "length")
-            diameter = getattr(pipe, "diameter")
+            length = pipe.length
+            diameter = pipe.diameter
             if not (length and diameter):
                 logger.warning("Ignored '%s' in aggregation", pipe)
                 continue
+            lengths_diameters.append((length, diameter))
 
-            diameter_times_length += diameter * length
-            total_length += length
-
-        if total_length != 0:
-            avg_diameter = diameter_times_length / total_length
+        total_length, avg_diameter = length_weighted_diameter(
+            lengths_diameters)
 
         result = dict(
             length=total_length,
@@ -341,10 +368,11 @@ class UnderfloorHeating(PipeStrand):
         Returns:
             True, if check succeeds and False if check fails.
         """
-        counts = np.unique(ports_coors[:, 2], return_counts=True)
+        # hash based count, there are only few distinct z planes
         # TODO: cluster z coordinates
-        idx_max = np.argmax(counts[1])
-        return counts[1][idx_max] / ports_coors.shape[0] >= tolerance
+        z_counts = Counter(ports_coors[:, 2].tolist())
+        _, count_max = z_counts.most_common(1)[0]
+        return count_max / ports_coors.shape[0] >= tolerance
 
     @staticmethod
     def get_pipe_strand_attributes(ports_coors: np.ndarray,
@@ -366,12 +394,18 @@ class UnderfloorHeating(PipeStrand):
             dist_x: Underfloor heating dimension in x.
             dist_y: Underfloor heating dimension in y.
         """
-        total_length = sum(segment.length for segment in chain if
-                           segment.length is not None)
-        avg_diameter = (sum(segment.diameter ** 2 * segment.length for segment
-                            in chain if segment.length is not
-                            None) / total_length) ** 0.5
-        length_unit = total_length.u
+        segments = [segment for segment in chain
+                    if segment.length is not None]
+        # sum plain magnitudes instead of adding up quantities one by one
+        length_unit = segments[0].length.u
+        diameter_unit = segments[0].diameter.u
+        lengths = np.array(
+            [segment.length.m_as(length_unit) for segment in segments])
+        diameters = np.array(
+            [segment.diameter.m_as(diameter_unit) for segment in segments])
+        total_length = lengths.sum() * length_unit
+        avg_diameter = np.sqrt(
+            (diameters ** 2 * lengths).sum() / lengths.sum()) * diameter_unit
         x_coord, y_coord = ports_coors[:, 0], ports_coors[:, 1]
         min_x = ports_coors[np.argmin(x_coord)][:2]
         max_x = ports_coors[np.argmax(x_coord)][:2]
@@ -417,26 +451,21 @@ class UnderfloorHeating(PipeStrand):
         """
         # ToDo: what if multiple pipe elements on the same line? Collinear
         #  algorithm, issue #211
-        orientations = {}
-        for element in chain:
-            if type(element) is hvac.Pipe:
-                a = abs(element.ports[0].position[1] -
-                        element.ports[1].position[1])
-                b = abs(element.ports[0].position[0] -
-                        element.ports[1].position[0])
-                if b != 0:
-                    theta = int(math.degrees(math.atan(a / b)))
-                else:
-                    theta = 90
-                if theta not in orientations:
-                    orientations[theta] = []
-                orientations[theta].append(element)
-        for orient in orientations.copy():
-            if len(orientations[orient]) < tolerance:
-                del orientations[orient]
-        orientations = list(sorted(orientations.items()))
-        x_spacing = dist_x / (len(orientations[0][1]) - 1)
-        y_spacing = dist_y / (len(orientations[1][1]) - 1)
+        # port positions of all pipes with shape (n, 2, 3)
+        positions = np.array(
+            [(element.ports[0].position, element.ports[1].position)
+             for element in chain if type(element) is hvac.Pipe]
+        ).reshape(-1, 2, 3)
+        a = np.abs(positions[:, 0, 1] - positions[:, 1, 1])
+        b = np.abs(positions[:, 0, 0] - positions[:, 1, 0])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            thetas = np.where(
+                b != 0, np.degrees(np.arctan(a / b)), 90).astype(int)
+        # number of pipes per orientation, sorted by angle
+        _, counts = np.unique(thetas, return_counts=True)
+        counts = counts[counts >= tolerance]
+        x_spacing = dist_x / (counts[0] - 1)
+        y_spacing = dist_y / (counts[1] - 1)
         return x_spacing, y_spacing
 
     @staticmethod
@@ -611,10 +640,7 @@ class ParallelPump(HVACAggregationMixin, hvac.Pump):
     def _calc_avg(self) -> dict:
         """Calculates the total length and average diameter of all pump-like
          elements."""
-        avg_diameter_strand = 0
-        total_length = 0
-        diameter_times_length = 0
-
+        lengths_diameters = []
         for item in self.not_pump_elements:
             if hasattr(item, "diameter") and hasattr(item, "length"):
                 length = item.length
@@ -622,14 +648,12 @@ class ParallelPump(HVACAggregationMixin, hvac.Pump):
                 if not (length and diameter):
                     logger.info("Ignored '%s' in aggregation", item)
                     continue
-
-                diameter_times_length += length * diameter
-                total_length += length
+                lengths_diameters.append((length, diameter))
             else:
                 logger.info("Ignored '%s' in aggregation", item)
 
-        if total_length != 0:
-            avg_diameter_strand = diameter_times_length / total_length
+        total_length, avg_diameter_strand = length_weighted_diameter(
+            lengths_diameters)
 
         result = dict(
             length=total_length,
@@ -1358,10 +1382,7 @@ class GeneratorOneFluid(HVACAggregationMixin, hvac.HVACProduct):
     @attribute.multi_calc
     def _calc_avg(self):
         """ Calculates the parameters of all the below listed elements."""
-        avg_diameter_strand = 0
-        total_length = 0
-        diameter_times_length = 0
-
+        lengths_diameters = []
         for element in self.not_whitelist_elements:
             if hasattr(element, "diameter") and hasattr(element, "length"):
                 length = element.length
@@ -1369,15 +1390,12 @@ class GeneratorOneFluid(HVACAggregationMixin, hvac.HVACProduct):
                 if not (length and diameter):
                     logger.info("Ignored '%s' in aggregation", element)
                     continue
-
-                diameter_times_length += diameter * length
-                total_length += length
-
+                lengths_diameters.append((length, diameter))
             else:
                 logger.info("Ignored '%s' in aggregation", element)
 
-        if total_length != 0:
-            avg_diameter_strand = diameter_times_length / total_length
+        total_length, avg_diameter_strand = length_weighted_diameter(
+            lengths_diameters)
 
         result = dict(
             length=total_length,
@@ -1,8 +1,12 @@
 import logging
 import pickle
 import re
+import sys
+from functools import lru_cache
 from json import JSONEncoder
-from typing import Union, Iterable, Dict, List, Tuple, Type, Optional, Any
+from typing import Union, Iterable, Dict, List, Tuple, Type, Optional, Any, \
+    Callable
+from weakref import WeakKeyDictionary
 
 import numpy as np
 import ifcopenshell.geom
@@ -24,6 +28,63 @@ logger = logging.getLogger(__name__)
 quality_logger = logging.getLogger('bim2sim.QualityReport')
 settings_products = ifcopenshell.geom.main.settings()
 settings_products.set(settings_products.USE_PYTHON_OPENCASCADE, True)
+# flags which can be scoped to a single group of an alternation
+_SCOPED_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'),
+                 (re.DOTALL, 's'), (re.VERBOSE, 'x'), (re.ASCII, 'a'))
+_GLOBAL_INLINE_FLAGS = re.compile(r'\(\?[aiLmsux]+\)')
+
+
+def _is_combinable(pattern: re.Pattern) -> bool:
+    """Check pattern matches the same as a group of an alternation.
+
+    Groups are renumbered in an alternation, which breaks backreferences and
+    can define a named group twice. Global inline flags are only allowed at
+    the start of the whole expression.
+    """
+    return (not pattern.groups
+            and not _GLOBAL_INLINE_FLAGS.search(pattern.pattern))
+
+
+def _combine_patterns(patterns: Iterable[re.Pattern]) -> re.Pattern:
+    """Combine patterns to a single alternation with one group per pattern.
+
+    Flags of the patterns are kept as scoped inline flags, so the index
+    of the matching pattern is given by the name of the outer group.
+    """
+    groups = []
+    for i, pattern in enumerate(patterns):
+        flags = ''.join(
+            char for flag, char in _SCOPED_FLAGS if pattern.flags & flag)
+        text = pattern.pattern
+        if pattern.flags & re.VERBOSE:
+            # end a trailing comment, else it swallows the closing parens
+            text += '\n'
+        if flags:
+            text = '(?%s:%s)' % (flags, text)
+        groups.append('(?P<g%d>%s)' % (i, text))
+    return re.compile('|'.join(groups))
+
+
+@lru_cache(maxsize=None)
+def _pattern_matcher(patterns: tuple) -> Callable[[str], Optional[re.Match]]:
+    """Get a function returning the match of the first matching pattern.
+
+    The patterns are matched at once by a combined alternation if all of them
+    are combinable, else one after another.
+    """
+    compiled = [re.compile(pattern) for pattern in patterns]
+    if not compiled:
+        return lambda value: None
+    if all(map(_is_combinable, compiled)):
+        return _combine_patterns(compiled).match
+
+    def match_first(value):
+        for pattern in compiled:
+            match = pattern.match(value)
+            if match:
+                return match
+        return None
+    return match_first
 
 
 class ElementError(Exception):
@@ -85,8 +146,13 @@ class Element(metaclass=attribute.AutoAttributeNameMeta):
 
     @cached_property
     def position(self) -> np.array:
-        """Position calculated only once by calling calc_position"""
-        return self.calc_position()
+        """Position calculated only once by calling calc_position
+
+        The returned array is read-only as it is shared by all callers."""
+        position = self.calc_position()
+        if isinstance(position, np.ndarray):
+            position.flags.writeable = False
+        return position
 
     @cached_property
     def orientation(self) -> np.array:
@@ -98,7 +164,7 @@ class Element(metaclass=attribute.AutoAttributeNameMeta):
         if prefix_length > 10:
             raise AttributeError("Max prefix length is 10!")
         Element._id_counter += 1
-        return "{0:0<8s}{1:0>14d}".format(prefix, Element._id_counter)
+        return prefix.ljust(8, '0') + str(Element._id_counter).zfill(14)
 
     @staticmethod
     def get_object(guid):
@@ -133,13 +199,11 @@ class Element(metaclass=attribute.AutoAttributeNameMeta):
         all attributes functions are used to calculate the remaining attributes
         """
 
-        all_attr_decisions = DecisionBunch()
-        for inst in elements:
-            bunch = inst.attributes.get_decisions()
-            all_attr_decisions.extend(bunch)
-
-        # sort decisions to preserve order
-        all_attr_decisions.sort(key=lambda d: d.global_key)
+        # collect in a single pass and sort decisions to preserve order
+        all_attr_decisions = DecisionBunch(sorted(
+            (decision for inst in elements
+             for decision in inst.attributes.get_decisions()),
+            key=lambda d: d.global_key))
         yield all_attr_decisions
 
     @classmethod
@@ -165,6 +229,9 @@ class IFCBased(Element):
 
     ifc_types: Dict[str, List[str]] = None
     pattern_ifc_type = []
+    # {ifc file: {(type guids, id of ifc units): (ifc units, propertysets)}}
+    # scoped to the ifc file, entries are dropped with the file
+    _type_propertysets_cache: WeakKeyDictionary = WeakKeyDictionary()
 
     def __init__(self, *args,
                  ifc=None,
@@ -175,6 +242,8 @@ class IFCBased(Element):
         super().__init__(*args, **kwargs)
 
         self.ifc = ifc
+        # interned, the same few type names are shared by many elements
+        self._ifc_type = sys.intern(ifc.is_a()) if ifc else None
         self.predefined_type = ifc2python.get_predefined_type(ifc)
         self.ifc_domain = ifc_domain
         self.finder = finder
@@ -185,6 +254,7 @@ class IFCBased(Element):
         self.enrichment = {}  # TODO: DJA
         self._propertysets = None
         self._type_propertysets = None
+        self._propertyset_hits = {}
         self._decision_results = {}
 
     @classmethod
@@ -203,8 +273,9 @@ class IFCBased(Element):
 
     @property
     def ifc_type(self):
-        if self.ifc:
-            return self.ifc.is_a()
+        if self._ifc_type is None and self.ifc:
+            self._ifc_type = sys.intern(self.ifc.is_a())
+        return self._ifc_type
 
     @classmethod
     def pre_validate(cls, ifc) -> bool:
@@ -214,15 +285,15 @@ class IFCBased(Element):
     def calc_position(self):
         """returns absolute position"""
         if hasattr(self.ifc, 'ObjectPlacement'):
-            absolute = np.array(self.ifc.ObjectPlacement.RelativePlacement.Location.Coordinates)
+            # sum up plain coordinate tuples and create one array at the end
+            absolute = self.ifc.ObjectPlacement.RelativePlacement.Location.Coordinates
             placementrel = self.ifc.ObjectPlacement.PlacementRelTo
             while placementrel is not None:
-                absolute += np.array(placementrel.RelativePlacement.Location.Coordinates)
+                relative = placementrel.RelativePlacement.Location.Coordinates
+                absolute = tuple(a + b for a, b in zip(absolute, relative))
                 placementrel = placementrel.PlacementRelTo
-        else:
-            absolute = None
-
-        return absolute
+            return np.array(absolute)
+        return None
 
     def calc_orientation(self) -> np.array:
         """Tries to calculate the orientation of based on DirectionRatio.
@@ -284,8 +355,28 @@ class IFCBased(Element):
 
     def get_type_propertysets(self):
         if self._type_propertysets is None:
-            self._type_propertysets = ifc2python.get_type_property_sets(
-                self.ifc, self.ifc_units)
+            # elements of the same types share the type propertysets, so they
+            # are only converted once per type (and units of the ifc file)
+            ifc_file = getattr(self.ifc, 'file', None)
+            if ifc_file is None:
+                self._type_propertysets = ifc2python.get_type_property_sets(
+                    self.ifc, self.ifc_units)
+                return self._type_propertysets
+            file_cache = IFCBased._type_propertysets_cache.setdefault(
+                ifc_file, {})
+            types = getattr(self.ifc, 'IsTypedBy', None) or ()
+            key = (tuple(rel.RelatingType.GlobalId for rel in types),
+                   id(self.ifc_units))
+            cached = file_cache.get(key)
+            if cached is None or cached[0] is not self.ifc_units:
+                # keep a reference to the units so their id is not reused
+                cached = (self.ifc_units, ifc2python.get_type_property_sets(
+                    self.ifc, self.ifc_units))
+                file_cache[key] = cached
+            # copy the propertysets, so changes made for one element do not
+            # leak into the other elements of the same type
+            self._type_propertysets = {
+                name: dict(p_set) for name, p_set in cached[1].items()}
         return self._type_propertysets
 
     def get_hierarchical_parent(self):
@@ -325,24 +416,18 @@ class IFCBased(Element):
         """Search for property in all related properties in hierarchical order.
 
         1. element's propertysets
-        2. element type's propertysets"""
+        2. element type's propertysets
 
-        p_set = None
-        p_sets = self.get_propertysets()
+        Results (including misses) are memorized per element."""
         try:
-            p_set = p_sets[propertyset_name]
+            return self._propertyset_hits[propertyset_name]
         except KeyError:
             pass
-        else:
-            return p_set
 
-        pt_sets = self.get_type_propertysets()
-        try:
-            p_set = pt_sets[propertyset_name]
-        except KeyError:
-            pass
-        else:
-            return p_set
+        p_set = self.get_propertysets().get(propertyset_name)
+        if p_set is None:
+            p_set = self.get_type_propertysets().get(propertyset_name)
+        self._propertyset_hits[propertyset_name] = p_set
         return p_set
 
     def inverse_properties(self):
@@ -354,13 +439,16 @@ class IFCBased(Element):
     def filter_properties(self, patterns):
         """filter all properties by re pattern
 
+        Each property is listed at most once, for the first pattern matching
+        it.
+
         :returns: list of tuple(propertyset_name, property_name, match_graph)"""
         matches = []
+        match_first = _pattern_matcher(tuple(patterns))
         for propertyset_name, property_name in self.inverse_properties():
-            for pattern in patterns:
-                match = re.match(pattern, property_name)
-                if match:
-                    matches.append((propertyset_name, property_name, match))
+            match = match_first(property_name)
+            if match:
+                matches.append((propertyset_name, property_name, match))
         return matches
 
     @classmethod
@@ -451,16 +539,6 @@ class IFCBased(Element):
         return f'{self.ifc_type}:{self.guid}'
 
 
-class RelationBased(IFCBased):
-    conditions = []
-
-    def __repr__(self):
-        return "<%s (guid: %s)>" % (self.__class__.__name__, self.guid)
-
-    def __str__(self):
-        return "%s" % self.__class__.__name__
-
-
 class RelationBased(IFCBased):
 
     pass
@@ -505,11 +583,8 @@ class ProductBased(IFCBased):
     @property
     def neighbors(self):
         """Directly connected elements"""
-        neighbors = []
-        for port in self.ports:
-            if port.connection:
-                neighbors.append(port.connection.parent)
-        return neighbors
+        return [port.connection.parent for port in self.ports
+                if port.connection]
 
     def validate_creation(self):
         """"Validate the element creation in two steps.
@@ -709,15 +784,6 @@ class Dummy(ProductBased):
         "IfcElementProxy": ['*']
     }
 
-    # def __init__(self, *args, **kwargs):
-    #     super().__init__(*args, **kwargs)
-    #
-    #     self._ifc_type = self.ifc.get_info()['type']
-
-    @property
-    def ifc_type(self):
-        return self._ifc_type
-
     def __str__(self):
         return "Dummy '%s'" % self.ifc_type
 
@@ -741,6 +807,9 @@ class Factory:
             finder: Union[TemplateFinder, None] = None,
             dummy=Dummy):
         self.mapping, self.blacklist, self.defaults = self.create_ifc_mapping(relevant_elements)
+        # resolved element classes by (ifc_type, predefined_type)
+        self._element_cache: Dict[Tuple[str, Union[str, None]],
+                                  Union[ProductBased, None]] = {}
         self.dummy_cls = dummy
         self.ifc_domain = ifc_domain
         self.finder = finder
@@ -765,7 +834,7 @@ class Factory:
         Returns:
             element: created element instance
         """
-        _ifc_type = ifc_type or ifc_entity.is_a()
+        _ifc_type = sys.intern(ifc_type or ifc_entity.is_a())
         predefined_type = ifc2python.get_predefined_type(ifc_entity)
         element_cls = self.get_element(_ifc_type, predefined_type)
         if not element_cls:
@@ -811,8 +880,21 @@ class Factory:
     def get_element(self, ifc_type: str, predefined_type: Union[str, None]) -> \
             Union[ProductBased, None]:
         """Get element class by ifc type and predefined type"""
+        cache_key = (ifc_type, predefined_type)
+        try:
+            return self._element_cache[cache_key]
+        except KeyError:
+            pass
+        element = self._lookup_element(ifc_type, predefined_type)
+        self._element_cache[cache_key] = element
+        return element
+
+    def _lookup_element(self, ifc_type: str,
+                        predefined_type: Union[str, None]) -> \
+            Union[ProductBased, None]:
+        ifc_type = ifc_type.lower()
         if predefined_type:
-            key = (ifc_type.lower(), predefined_type.upper())
+            key = (ifc_type, predefined_type.upper())
             # 1. go over normal list, if found match_graph --> return
             element = self.mapping.get(key)
             if element:
@@ -821,7 +903,7 @@ class Factory:
             if key in self.blacklist:
                 return None
         # 3. go over default list, if found match_graph --> return
-        return self.defaults.get(ifc_type.lower())
+        return self.defaults.get(ifc_type)
 
     # def _get_by_guid(self, guid: str) -> Union[ProductBased, None]:
     #     """Get item from given guid created by this factory."""
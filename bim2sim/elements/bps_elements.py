@@ -1,9 +1,7 @@
 """Module contains the different classes for all HVAC elements"""
-import inspect
 import logging
 import math
 import re
-import sys
 from datetime import date
 from typing import Set, List
 
@@ -31,7 +29,6 @@ from bim2sim.kernel.decorators import cached_property
 from bim2sim.elements.mapping import condition, attribute
 from bim2sim.elements.base_elements import ProductBased, RelationBased
 from bim2sim.elements.mapping.units import ureg
-from bim2sim.tasks.common.inner_loop_remover import remove_inner_loops
 from bim2sim.utilities.common_functions import vector_angle, angle_equivalent
 from bim2sim.utilities.pyocc_tools import PyOCCTools
 from bim2sim.utilities.types import IFCDomain
@@ -937,6 +934,9 @@ class SpaceBoundary(RelationBased):
                     temp_sore.InnerBoundaries = ()
                     shape = ifcopenshell.geom.create_shape(settings, temp_sore)
                 else:
+                    # imported here as bim2sim.tasks.common imports elements
+                    from bim2sim.tasks.common.inner_loop_remover import \
+                        remove_inner_loops
                     shape = remove_inner_loops(shape)
             if not (sore.InnerBoundaries and not self.bound_element.ifc.is_a(
                     'IfcWall')):
@@ -1943,11 +1943,9 @@ class SpaceBoundaryRepresentation(BPSProduct):
 
 
 # collect all domain classes
-items: Set[BPSProduct] = set()
-for name, cls in inspect.getmembers(
-        sys.modules[__name__],
-        lambda member: inspect.isclass(member)  # class at all
-        and issubclass(member, BPSProduct)  # domain subclass
-        and member is not BPSProduct  # but not base class
-        and member.__module__ == __name__):  # declared here
-    items.add(cls)
+items: Set[BPSProduct] = {
+    member for member in list(globals().values())
+    if isinstance(member, type)  # class at all
+    and issubclass(member, BPSProduct)  # domain subclass
+    and member is not BPSProduct  # but not base class
+    and member.__module__ == __name__}  # declared here
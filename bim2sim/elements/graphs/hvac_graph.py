@@ -36,11 +36,11 @@ class HvacGraph(nx.Graph):
 
         nodes = [port for instance in elements for port in instance.ports
                  if port.connection]
-        inner_edges = [connection for instance in elements
-                       for connection in instance.inner_connections]
-        edges = [(port, port.connection) for port in nodes if port.connection]
-
-        self.update(nodes=nodes, edges=edges + inner_edges)
+        self.add_nodes_from(nodes)
+        # edges are streamed into the graph without collecting them first
+        self.add_edges_from((port, port.connection) for port in nodes)
+        self.add_edges_from(connection for instance in elements
+                            for connection in instance.inner_connections)
 
     @staticmethod
     def _contract_ports_into_elements(graph, port_nodes):
@@ -48,16 +48,31 @@ class HvacGraph(nx.Graph):
         Contract the port nodes into the belonging instance nodes for better
         handling, the information about the ports is still accessible via the
         get_contractions function.
-        :return:
+        The passed graph is not modified. Callers have to use the returned
+        graph, earlier versions returned the passed graph unchanged.
+        :param graph: graph with ports as nodes
+        :param port_nodes: ports to contract into their parent elements
+        :return: new graph of the same class with elements as nodes
         """
-        new_graph = graph.copy()
         logger.info("Contracting ports into elements ...")
-        for port in port_nodes:
-            new_graph = nx.contracted_nodes(new_graph, port.parent, port)
+        # relabel all edges in a single pass instead of contracting each port
+        # on its own, which would copy the whole graph per port
+        parent_of = {port: port.parent for port in port_nodes}
+        new_graph = graph.__class__()
+        new_graph.add_nodes_from(
+            parent_of.get(node, node) for node in graph.nodes)
+        for node_a, node_b in graph.edges:
+            parent_a = parent_of.get(node_a, node_a)
+            parent_b = parent_of.get(node_b, node_b)
+            if parent_a is not parent_b:
+                new_graph.add_edge(parent_a, parent_b)
+        for port, parent in parent_of.items():
+            new_graph.nodes[parent].setdefault('contraction', {})[port] = \
+                dict(graph.nodes[port])
         logger.info("Contracted the ports into node elements, this"
                     " leads to %d nodes.",
                     new_graph.number_of_nodes())
-        return graph
+        return new_graph
 
     @property
     def element_graph(self) -> nx.Graph:
@@ -77,12 +92,11 @@ class HvacGraph(nx.Graph):
 
     @staticmethod
     def get_not_contracted_neighbors(graph, node):
-        neighbors = list(
-            set(nx.all_neighbors(graph, node)) -
-            set(graph.node[node]['contracted_nodes']) -
-            {node}
-        )
-        return neighbors
+        """Returns the neighbors of node which are not contracted into it."""
+        # contraction dict is used for lookup to avoid building sets
+        contracted = graph.nodes[node].get('contraction', {})
+        return [neighbor for neighbor in graph.adj[node]
+                if neighbor is not node and neighbor not in contracted]
 
     def get_contractions(self, node):
         """
@@ -90,12 +104,7 @@ class HvacGraph(nx.Graph):
         :param node: node in whose connections you are interested
         :return:
         """
-        node = self.nodes[node]
-        inner_nodes = []
-        if 'contraction' in node:
-            for contraction in node['contraction'].keys():
-                inner_nodes.append(contraction)
-        return inner_nodes
+        return list(self.nodes[node].get('contraction', ()))
 
     def get_cycles(self):
         """
@@ -130,23 +139,35 @@ class HvacGraph(nx.Graph):
         """
 
         undirected_graph = element_graph
-        nodes_degree2 = [v for v, d in undirected_graph.degree() if 1 <= d <= 2
-                         and type(v) in types]
+        types = set(types)
+        # element graphs have no self loops, so degree is the adjacency size
+        nodes_degree2 = [v for v, adj in undirected_graph.adj.items()
+                         if 1 <= len(adj) <= 2 and type(v) in types]
         subgraph_aggregations = nx.subgraph(undirected_graph, nodes_degree2)
+        # neighbors inside the subgraph, filtered once instead of on every
+        # lookup through the subgraph view
+        chain_nodes = set(nodes_degree2)
+        adjacency = {v: [n for n in undirected_graph.adj[v] if n in chain_nodes]
+                     for v in nodes_degree2}
 
         chain_lists = []
         # order elements as connected
 
         for component in nx.connected_components(subgraph_aggregations):
-            subgraph = subgraph_aggregations.subgraph(component).copy()
-            end_nodes = [v for v, d in subgraph.degree() if d == 1]
+            end_nodes = [v for v in component if len(adjacency[v]) == 1]
 
             if len(end_nodes) != 2:
                 if include_singles:
-                    chain_lists.append(list(subgraph.nodes))
+                    chain_lists.append(list(component))
                 continue
-            # TODO more efficient
-            elements = nx.shortest_path(subgraph, *end_nodes)
+            # all nodes have degree <= 2, so the component is a simple path
+            # which can be walked from one end to the other
+            previous, current = None, end_nodes[0]
+            elements = [current]
+            while current is not end_nodes[1]:
+                previous, current = current, next(
+                    v for v in adjacency[current] if v is not previous)
+                elements.append(current)
             chain_lists.append(elements)
 
         return chain_lists
@@ -199,7 +220,6 @@ class HvacGraph(nx.Graph):
         """
         # importing matplotlib is slow and plotting is optional
         import matplotlib.pyplot as plt
-        from pyvis.network import Network
 
         # https://plot.ly/python/network-graphs/
         edge_colors_flow_side = {
@@ -246,6 +266,7 @@ class HvacGraph(nx.Graph):
                 edge_color_map.append(edge_colors_flow_side[side]['edge_color'])
             kwargs['edge_color'] = edge_color_map
         if use_pyvis:
+            from pyvis.network import Network
             # convert all edges to strings to use dynamic plotting via pyvis
             graph_cp = graph.copy()
             nodes = graph_cp.nodes()
@@ -370,7 +391,7 @@ class HvacGraph(nx.Graph):
             name = 'element_graph_cytoscape.json'
         with open(path / name, 'w') as fp:
             json.dump(json_graph.cytoscape_data(export_graph), fp,
-                      cls=ElementEncoder)
+                      cls=ElementEncoder, separators=(',', ':'))
 
     def to_serializable(self):
         """Returns a json serializable object"""
@@ -453,7 +474,8 @@ class HvacGraph(nx.Graph):
         """Returns a list of cycles with wanted element in it."""
         # todo how to handle cascaded boilers
 
-        directed = graph.to_directed()
+        # a read-only view is enough to search the cycles
+        directed = graph.to_directed(as_view=True)
         simple_cycles = list(nx.simple_cycles(directed))
         # filter cycles:
         cycles = [cycle for cycle in simple_cycles for node in cycle if
@@ -470,12 +492,13 @@ class HvacGraph(nx.Graph):
 
         # group cycles by wanted elements
         wanted_elements = [node for node in graph.nodes if type(node) in wanted]
+        # sets of the cycle nodes for O(1) membership checks
+        cycle_members = [set(cycle) for cycle in unique_cycles]
         cycles_dict = {}
         for wanted_element in wanted_elements:
-            cycles_dict[wanted_element] = []
-            for cycle in unique_cycles:
-                if wanted_element in cycle:
-                    cycles_dict[wanted_element].append(cycle)
+            cycles_dict[wanted_element] = [
+                cycle for cycle, members in zip(unique_cycles, cycle_members)
+                if wanted_element in members]
 
         return cycles_dict
 
@@ -778,15 +801,16 @@ class HvacGraph(nx.Graph):
         #             create_subgraph(G, sub_G, n)
 
         nodes = [root]
-        # get direct neighbors
-        neighbors_root = nx.all_neighbors(graph, root)
+        # get direct neighbors from the adjacency, graph is undirected
+        adjacency = graph.adj
+        neighbors_root = adjacency[root]
         if not neighbors_root:
             return nodes
         # loop through neighbors until next junction
         for neighbor in neighbors_root:
             while True:
                 neighbors = [neighbor for neighbor in
-                             nx.all_neighbors(graph, neighbor) if not
+                             adjacency[neighbor] if not
                              neighbor in nodes]
                 if not neighbors:
                     break
@@ -839,7 +863,10 @@ class HvacGraph(nx.Graph):
             AssertionError: If the provided elements are not part of the graph.
 
         """
-        if not set(elements).issubset(set(self.elements)):
+        # an element is part of the graph if any of its ports is a node, this
+        # avoids collecting all elements of the graph for every subgraph
+        if not all(any(port in self for port in ele.ports)
+                   for ele in elements):
             raise AssertionError('The elements %s are not part of this graph.',
                                  elements)
         return self.subgraph((port for ele in elements for port in ele.ports))
@@ -1,13 +1,15 @@
 ﻿"""Module contains the different classes for all HVAC elements"""
-import inspect
 import itertools
 import logging
 import math
 import re
-import sys
 from typing import Set, List, Tuple, Generator, Union, Type
 
 import numpy as np
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 from bim2sim.kernel.decision import ListDecision, DecisionBunch
 from bim2sim.kernel.decorators import cached_property
@@ -33,6 +35,98 @@ def length_post_processing(value):
     return value
 
 
+def _port_position(rx0, rx1, rx2, rz0, rz1, rz2, l0, l1, l2, parent_position):
+    """Transform a port location relative to its parent to absolute position.
+
+    The y direction (cross product of z and x direction) and the product of the
+    direction matrix with the location are written out as scalar arithmetic,
+    which is much cheaper than numpy calls for single 3-vectors.
+    """
+    ry0 = rz1 * rx2 - rz2 * rx1
+    ry1 = rz2 * rx0 - rz0 * rx2
+    ry2 = rz0 * rx1 - rz1 * rx0
+    return np.array((
+        parent_position[0] + rx0 * l0 + ry0 * l1 + rz0 * l2,
+        parent_position[1] + rx1 * l0 + ry1 * l1 + rz1 * l2,
+        parent_position[2] + rx2 * l0 + ry2 * l1 + rz2 * l2,
+    ))
+
+
+if njit is not None:
+    # compiled once and cached on disk, speeds up the many single port calls
+    _port_position = njit(cache=True)(_port_position)
+
+
+_X_DIRECTION = (1., 0., 0.)
+_Z_DIRECTION = (0., 0., 1.)
+
+
+def _placement_directions(element) -> Tuple[tuple, tuple]:
+    """Get x and z direction of the relative placement of an element.
+
+    Falls back to the global axes if the placement defines no directions.
+    """
+    placement = getattr(getattr(element.ifc, 'ObjectPlacement', None),
+                        'RelativePlacement', None)
+    ref_direction = getattr(placement, 'RefDirection', None)
+    axis = getattr(placement, 'Axis', None)
+    if ref_direction is None or axis is None:
+        return _X_DIRECTION, _Z_DIRECTION
+    return ref_direction.DirectionRatios, axis.DirectionRatios
+
+
+def calc_port_positions(ports: List['HVACPort']):
+    """Calculate the absolute positions of many ports at once.
+
+    The per port calculation of HVACPort.calc_position is vectorized over all
+    given ports. The results are stored as cached position of each port, so
+    later access to port.position is free. Ports with an already cached
+    position, without usable placement information or of a subclass with its
+    own calc_position (e.g. HVACAggregationPort) are skipped and keep their
+    lazy calculation.
+
+    Args:
+        ports: HVACPorts to calculate the positions for
+    """
+    todo = []
+    parent_positions = []
+    relative_locations = []
+    for port in ports:
+        if type(port).calc_position is not HVACPort.calc_position:
+            continue
+        if port.__dict__.get('position') is not None:
+            continue
+        try:
+            location = \
+                port.ifc.ObjectPlacement.RelativePlacement.Location.Coordinates
+            parent_position = port.parent.position
+        except AttributeError:
+            continue
+        if parent_position is None or len(location) != 3:
+            continue
+        todo.append(port)
+        parent_positions.append(parent_position)
+        relative_locations.append(location)
+    if not todo:
+        return
+
+    n = len(todo)
+    x_directions = np.empty((n, 3))
+    z_directions = np.empty((n, 3))
+    for i, port in enumerate(todo):
+        x_directions[i], z_directions[i] = _placement_directions(port.parent)
+    y_directions = np.cross(z_directions, x_directions)
+    directions = np.stack((x_directions, y_directions, z_directions), axis=2)
+    coordinates = np.asarray(parent_positions, dtype=float) + np.einsum(
+        'nij,nj->ni', directions, np.asarray(relative_locations, dtype=float))
+    coordinates.flags.writeable = False
+
+    for port, position in zip(todo, coordinates):
+        if not position.any():
+            quality_logger.info("Suspect position [0, 0, 0] for %s", port)
+        port.__dict__['position'] = position
+
+
 class HVACPort(Port):
     """Port of HVACProduct."""
     vl_pattern = re.compile('.*vorlauf.*',
@@ -69,24 +163,15 @@ class HVACPort(Port):
 
     def calc_position(self) -> np.array:
         """returns absolute position as np.array"""
-        try:
-            relative_placement = \
-                self.parent.ifc.ObjectPlacement.RelativePlacement
-            x_direction = np.array(
-                relative_placement.RefDirection.DirectionRatios)
-            z_direction = np.array(relative_placement.Axis.DirectionRatios)
-        except AttributeError:
-            x_direction = np.array([1, 0, 0])
-            z_direction = np.array([0, 0, 1])
-        y_direction = np.cross(z_direction, x_direction)
-        directions = np.array((x_direction, y_direction, z_direction)).T
-        port_coordinates_relative = \
-            np.array(
-                self.ifc.ObjectPlacement.RelativePlacement.Location.Coordinates)
-        coordinates = self.parent.position + np.matmul(directions,
-                                                       port_coordinates_relative)
-
-        if all(coordinates == np.array([0, 0, 0])):
+        x_direction, z_direction = _placement_directions(self.parent)
+        location = self.ifc.ObjectPlacement.RelativePlacement.Location
+        # plain floats only, so the compiled version is specialized only once
+        coordinates = _port_position(
+            *map(float, itertools.chain(
+                x_direction, z_direction, location.Coordinates)),
+            np.asarray(self.parent.position, dtype=float))
+
+        if not coordinates.any():
             quality_logger.info("Suspect position [0, 0, 0] for %s", self)
         return coordinates
 
@@ -198,6 +283,8 @@ class HVACPort(Port):
 
 class HVACProduct(ProductBased):
     domain = 'HVAC'
+    # predefined types of IfcDistributionPort which are no HVAC ports
+    non_hvac_port_types = frozenset(('CABLE', 'CABLECARRIER', 'WIRELESS'))
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -220,24 +307,17 @@ class HVACProduct(ProductBased):
 
     def get_ports(self) -> list:
         """Returns a list of ports of this product."""
-        ports = ifc2py_get_ports(self.ifc)
         hvac_ports = []
-        for port in ports:
-            port_valid = True
-            if port.is_a() != 'IfcDistributionPort':
-                port_valid = False
-            else:
-                predefined_type = get_predefined_type(port)
-                if predefined_type in [
-                    'CABLE', 'CABLECARRIER', 'WIRELESS']:
-                    port_valid = False
-            if port_valid:
+        for port in ifc2py_get_ports(self.ifc):
+            port_type = port.is_a()
+            if port_type == 'IfcDistributionPort' and get_predefined_type(
+                    port) not in self.non_hvac_port_types:
                 hvac_ports.append(HVACPort.from_ifc(
                     ifc=port, parent=self))
             else:
                 logger.warning(
                     "Not included %s as Port in %s with GUID %s",
-                    port.is_a(),
+                    port_type,
                     self.__class__.__name__,
                     self.guid)
         return hvac_ports
@@ -247,11 +327,11 @@ class HVACProduct(ProductBased):
 
         By default each port is connected to each other port.
         Overwrite for other connections."""
-
-        connections = []
-        for port0, port1 in itertools.combinations(self.ports, 2):
-            connections.append((port0, port1))
-        return connections
+        ports = self.ports
+        if len(ports) == 2:
+            # most common case of elements with inlet and outlet
+            return [(ports[0], ports[1])]
+        return list(itertools.combinations(ports, 2))
 
     def decide_inner_connections(self) -> Generator[DecisionBunch, None, None]:
         """Generator method yielding decisions to set inner connections."""
@@ -1341,11 +1421,9 @@ class CHP(HVACProduct):
 
 
 # collect all domain classes
-items: Set[HVACProduct] = set()
-for name, cls in inspect.getmembers(
-        sys.modules[__name__],
-        lambda member: inspect.isclass(member)  # class at all
-                       and issubclass(member, HVACProduct)  # domain subclass
-                       and member is not HVACProduct  # but not base class
-                       and member.__module__ == __name__):  # declared here
-    items.add(cls)
+items: Set[HVACProduct] = {
+    member for member in list(globals().values())
+    if isinstance(member, type)  # class at all
+    and issubclass(member, HVACProduct)  # domain subclass
+    and member is not HVACProduct  # but not base class
+    and member.__module__ == __name__}  # declared here
@@ -1,6 +1,7 @@
 import logging
 from functools import partial
-from typing import Tuple, Iterable, Callable, Any, Union
+from typing import Tuple, Iterable, Callable, Any, Union, FrozenSet
+from weakref import WeakKeyDictionary
 
 import pint
 
@@ -12,15 +13,16 @@ from bim2sim.utilities.types import AttributeDataSource
 logger = logging.getLogger(__name__)
 quality_logger = logging.getLogger('bim2sim.QualityReport')
 
+# marker for missing ifc attributes, None is a valid attribute value
+_MISSING = object()
+
 
 class AutoAttributeNameMeta(type):
-    """Detect setting on Attributes on class level and set name as given"""
+    """Detect setting on Attributes on class level and set name as given
 
-    def __init__(cls, name, bases, namespace):
-        super(AutoAttributeNameMeta, cls).__init__(name, bases, namespace)
-        for name, obj in namespace.items():
-            if isinstance(obj, Attribute):
-                obj.name = name
+    The names are set by Attribute.__set_name__ during class creation, so no
+    scan of the class namespace is needed here. The metaclass is kept as
+    extension point for element classes."""
 
     # def __setattr__(cls, name, value):
     #     if isinstance(value, Attribute):
@@ -46,6 +48,7 @@ class Attribute:
     STATUS_REQUESTED = 'REQUESTED'
     STATUS_AVAILABLE = 'AVAILABLE'
     STATUS_NOT_AVAILABLE = 'NOT_AVAILABLE'
+    _resolved_states = frozenset((STATUS_AVAILABLE, STATUS_NOT_AVAILABLE))
 
     def __init__(self,
                  description: str = "",
@@ -86,7 +89,7 @@ class Attribute:
             attr_type: data type of attribute, used to determine decision type
                 if decision is needed, float is default
         """
-        self.name = None  # auto set by AutoAttributeNameMeta
+        self.name = None  # auto set by __set_name__ on class creation
         self.description = description
         self.unit = unit
 
@@ -107,6 +110,9 @@ class Attribute:
 
         # TODO argument for validation function
 
+    def __set_name__(self, owner, name):
+        self.name = name
+
     def to_aggregation(self, calc=None, **kwargs):
         """Create new Attribute suited for aggregation."""
         options = {
@@ -125,8 +131,8 @@ class Attribute:
         if bind.ifc:  # don't bother if there is no ifc
             # default ifc attribute
             if value is None and self.ifc_attr_name:
-                if hasattr(bind.ifc, self.ifc_attr_name):
-                    raw_value = getattr(bind.ifc, self.ifc_attr_name)
+                raw_value = getattr(bind.ifc, self.ifc_attr_name, _MISSING)
+                if raw_value is not _MISSING:
                     value = self.ifc_post_processing(raw_value)
                     if value is not None:
                         data_source = AttributeDataSource.ifc_attr
@@ -219,7 +225,7 @@ class Attribute:
         finder = getattr(bind, 'finder', None)
         if finder:  # Aggregations have no finder
             try:
-                return bind.finder.find(bind, name)
+                return finder.find(bind, name)
             except (AttributeError, TypeError):
                 pass
         return None
@@ -473,6 +479,9 @@ class Attribute:
 
         # read current value and status
         value_or_decision, status, data_source = self._inner_get(bind)
+        if status in self._resolved_states:
+            # fast path for the common case of an already resolved attribute
+            return value_or_decision
         changed = False
         value = None
 
@@ -538,16 +547,25 @@ class AttributeManager(dict):
         value: tuple with (value of attribute, Status of attribute).
     """
 
+    # attribute names per element class, collected once per class. Weak keys
+    # don't keep classes alive, e.g. classes created in tests.
+    _names_by_class: 'WeakKeyDictionary[type, Tuple[str, ...]]' = \
+        WeakKeyDictionary()
+    _name_set_by_class: 'WeakKeyDictionary[type, FrozenSet[str]]' = \
+        WeakKeyDictionary()
+
     def __init__(self, bind):
         super().__init__()
         self.bind = bind
 
-        for name in self.names:
+        names = self.names
+        self._name_set = self._name_set_by_class[type(bind)]
+        for name in names:
             attr = self.get_attribute(name)
             attr.initialize(self)
 
     def __setitem__(self, name, value):
-        if name not in self.names:
+        if name not in self._name_set:
             raise AttributeError("Invalid Attribute '%s'. Choices are %s" % (
                 name, list(self.names)))
         if isinstance(value, tuple) and len(value) == 3:
@@ -624,19 +642,24 @@ class AttributeManager(dict):
         return attr.unit
 
     @property
-    def names(self):
-        """Returns a generator object with all attributes that the corresponding
-        bind owns."""
-        return (name for name in dir(type(self.bind))
-                if isinstance(getattr(type(self.bind), name), Attribute))
+    def names(self) -> Tuple[str, ...]:
+        """Returns a tuple with the names of all attributes that the
+        corresponding bind owns."""
+        bind_cls = type(self.bind)
+        try:
+            return self._names_by_class[bind_cls]
+        except KeyError:
+            names = tuple(name for name in dir(bind_cls)
+                          if isinstance(getattr(bind_cls, name), Attribute))
+            self._names_by_class[bind_cls] = names
+            self._name_set_by_class[bind_cls] = frozenset(names)
+            return names
 
     def get_decisions(self) -> DecisionBunch:
         """Return all decision of attributes with status REQUESTED."""
-        decisions = DecisionBunch()
-        for dec, status, data_source in self.values():
-            if status == Attribute.STATUS_REQUESTED:
-                decisions.append(dec)
-        return decisions
+        return DecisionBunch(
+            dec for dec, status, data_source in self.values()
+            if status == Attribute.STATUS_REQUESTED)
 
 
 def multi_calc(func):
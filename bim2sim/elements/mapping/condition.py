@@ -7,19 +7,12 @@ from bim2sim.elements.mapping.units import ureg
 class Condition:
     """Class for validating an element by a condition"""
 
-    _logger = None
+    logger = logging.getLogger(__name__)
 
     def __init__(self, name, critical_for_creation=True):
         self.name = name
         self.critical_for_creation = critical_for_creation
 
-    @property
-    def logger(self):
-        """logger instance"""
-        if not Condition._logger:
-            Condition._logger = logging.getLogger(__name__)
-        return Condition._logger
-
     def check(self, element, value):
         pass
 
@@ -16,7 +16,7 @@ from ifcopenshell import file, entity_instance
 import bim2sim
 from bim2sim.kernel.decision import ListDecision, Decision, DecisionBunch
 from bim2sim.elements.mapping import ifc2python
-from bim2sim.utilities.common_functions import validateJSON
+from bim2sim.utilities.common_functions import load_json
 
 if TYPE_CHECKING:
     from bim2sim.elements.base_elements import IFCBased
@@ -79,11 +79,7 @@ class TemplateFinder(Finder):
         for json_file_path in json_gen:
             if json_file_path.name.lower().startswith(TemplateFinder.prefix):
                 tool_name = json_file_path.stem[len(TemplateFinder.prefix):]
-                if validateJSON(json_file_path):
-                    with open(json_file_path, 'rb') as json_file:
-                        self.templates[tool_name] = json.load(json_file)
-                else:
-                    raise ValueError(f"Invalid JSON in {json_file_path}")
+                self.templates[tool_name] = load_json(json_file_path)
 
     def save(self, path):
         """Save templates to path, one file for each tool in templates.
@@ -125,7 +121,9 @@ class TemplateFinder(Finder):
         if not self.enabled:
             raise AttributeError("Finder is disabled")
 
-        self._get_elements_source_tool(element)
+        if element.source_tool is None:
+            # resolve only once per element, the owner history is not changed
+            self._get_elements_source_tool(element)
         if not element.source_tool:
             return None
         key1 = element.source_tool.templ_name
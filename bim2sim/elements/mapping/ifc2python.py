@@ -540,19 +540,12 @@ def get_ports(element: entity_instance) -> list[Any]:
     Returns:
         ports: list of all ports connected to the element
     """
-    ports = []
     # new IfcStandard with IfcRelNests
-    ports_nested = list(getattr(element, 'IsNestedBy', []))
+    ports = [port for nested in getattr(element, 'IsNestedBy', ())
+             for port in nested.RelatedObjects]
     # old IFC standard with IfcRelConnectsPortToElement
-    ports_connects = list(getattr(element, 'HasPorts', []))
-
-    for nested in ports_nested:
-        for port_connection in nested.RelatedObjects:
-            ports.append(port_connection)
-
-    for connected in ports_connects:
-        ports.append(connected.RelatingPort)
-
+    ports.extend(connected.RelatingPort
+                 for connected in getattr(element, 'HasPorts', ()))
     return ports
 
 
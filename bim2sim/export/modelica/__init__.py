@@ -307,6 +307,28 @@ class ModelicaElement:
         cls = ModelicaElement.lookup.get(element.__class__, ModelicaElement.dummy)
         return cls(element)
 
+    @staticmethod
+    def factory_many(elements: Iterable[HVACProduct]) \
+            -> Dict[HVACProduct, 'ModelicaElement']:
+        """Create models for all given elements.
+
+        Same as calling factory() for each element, but the lookup is bound
+        only once for the whole batch.
+
+        Args:
+            elements: elements to create models for
+
+        Returns:
+            dict with element as key and created model as value
+        """
+        if not ModelicaElement._initialized:
+            raise FactoryError("Factory not initialized.")
+
+        get_cls = ModelicaElement.lookup.get
+        dummy = ModelicaElement.dummy
+        return {element: get_cls(element.__class__, dummy)(element)
+                for element in elements}
+
     def _set_parameter(self, name, unit, required, **kwargs):
         """ Sets a parameter for the instance.
 
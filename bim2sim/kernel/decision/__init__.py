@@ -12,12 +12,19 @@ import enum
 import hashlib
 import json
 import logging
-from collections import Counter
+import math
+from functools import lru_cache
 from typing import Iterable, Callable, List, Dict, Any, Tuple, Union
 
 import pint
 
 from bim2sim.elements.mapping.units import ureg
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,6 +71,29 @@ def convert(from_version, to_version, data):
         return convert_0_to_0_1(data)
 
 
+_CHECKSUM_CACHE: Dict[Any, str] = {}
+_CHECKSUM_CACHE_SIZE = 1024
+
+
+def _build_checksum(item) -> str:
+    return hashlib.md5(json.dumps(item, sort_keys=True)
+                       .encode('utf-8')).hexdigest()
+
+
+def _checksum_key(item):
+    """Create hashable representation of a JSON serializable item.
+
+    Types are kept in the key, because e.g. True == 1 but both are dumped
+    differently.
+    """
+    if isinstance(item, dict):
+        return dict, tuple(sorted(
+            (k, _checksum_key(v)) for k, v in item.items()))
+    if isinstance(item, (list, tuple)):
+        return list, tuple(_checksum_key(v) for v in item)
+    return type(item), item
+
+
 class Decision:
     """A question and a value which should be set to answer the question.
 
@@ -111,6 +141,8 @@ class Decision:
     SKIPALL = "skip all"
     CANCEL = "cancel"
     options = [SKIP, SKIPALL, CANCEL]
+    _options_no_skip = (CANCEL,)
+    _options_skip = (CANCEL, SKIP)
 
     def __init__(self, question: str, console_identifier: str = None,
                  validate_func: Callable = None,
@@ -126,6 +158,8 @@ class Decision:
 
         self.question = question
         self.console_identifier = console_identifier
+        if validate_func is not None and type(validate_func) is not list:
+            validate_func = [validate_func]
         self.validate_func = validate_func
         self.default = None
         if default is not None:
@@ -168,6 +202,9 @@ class Decision:
             raise AssertionError("Can't change value of frozen decision")
         # if self.status != Status.pending:
         #     raise ValueError("Decision is not pending. Call reset() first.")
+        if value is None:
+            self.skip()
+            return
         _value = self.convert(value)
         if _value is None:
             self.skip()
@@ -216,9 +253,22 @@ class Decision:
 
     @staticmethod
     def build_checksum(item):
-        """Create checksum for item."""
-        return hashlib.md5(json.dumps(item, sort_keys=True)
-                           .encode('utf-8')).hexdigest()
+        """Create checksum for item.
+
+        Checksums are cached, as the same items (e.g. lists of choices) are
+        usually hashed for many decisions.
+        """
+        try:
+            key = _checksum_key(item)
+            checksum = _CHECKSUM_CACHE.get(key)
+        except TypeError:
+            # not hashable, e.g. a set nested in item
+            return _build_checksum(item)
+        if checksum is None:
+            if len(_CHECKSUM_CACHE) >= _CHECKSUM_CACHE_SIZE:
+                _CHECKSUM_CACHE.clear()
+            checksum = _CHECKSUM_CACHE[key] = _build_checksum(item)
+        return checksum
 
     def convert(self, value):
         """Convert value to inner type."""
@@ -230,22 +280,20 @@ class Decision:
     def validate(self, value) -> bool:
         """Checks value with validate_func and returns truth value."""
         _value = self.convert(value)
-        basic_valid = self._validate(_value)
-
+        if not self._validate(_value):
+            return False
         if self.validate_func:
-            if type(self.validate_func) is not list:
-                self.validate_func = [self.validate_func]
-            check_list = []
-            for fnc in self.validate_func:
-                try:
-                    check_list.append(bool(fnc(_value)))
-                except:
-                    check_list.append(False)
-            external_valid = all(check_list)
-        else:
-            external_valid = True
+            return all(self._validate_external(fnc, _value)
+                       for fnc in self.validate_func)
+        return True
 
-        return basic_valid and external_valid
+    @staticmethod
+    def _validate_external(fnc: Callable, value) -> bool:
+        """Run external validation function, failing calls are invalid."""
+        try:
+            return bool(fnc(value))
+        except Exception:
+            return False
 
     def valid(self) -> bool:
         """Check if Decision is valid."""
@@ -260,8 +308,6 @@ class Decision:
             return
         valid = False
         if self.validate_func:
-            if type(self.validate_func) is not list:
-                self.validate_func = [self.validate_func]
             check_list = []
             for fnc in self.validate_func:
                 check_list.append(bool(fnc(value)))
@@ -292,13 +338,9 @@ class Decision:
             kwargs['checksum'] = self.validate_checksum
         return kwargs
 
-    def get_options(self):
+    def get_options(self) -> Tuple[str, ...]:
         """Get all available options."""
-        options = [Decision.CANCEL]
-        if self.allow_skip:
-            options.append(Decision.SKIP)
-
-        return options
+        return self._options_skip if self.allow_skip else self._options_no_skip
 
     def get_question(self) -> str:
         """Get the question."""
@@ -329,12 +371,12 @@ class RealDecision(Decision):
         super().__init__(*args, **kwargs)
 
     def convert(self, value):
-        if not isinstance(value, pint.Quantity):
-            try:
-                return value * self.unit
-            except:
-                pass
-        return value
+        if isinstance(value, pint.Quantity):
+            return value
+        try:
+            return value * self.unit
+        except:
+            return value
 
     def _validate(self, value):
         if isinstance(value, pint.Quantity):
@@ -366,15 +408,22 @@ class RealDecision(Decision):
         return kwargs
 
     def reset_from_deserialized(self, kwargs):
-        kwargs['value'] = kwargs['value'] * ureg[kwargs.pop('unit', str(self.unit))]
+        kwargs['value'] = kwargs['value'] * _parse_unit(
+            kwargs.pop('unit', str(self.unit)))
         super().reset_from_deserialized(kwargs)
 
 
+@lru_cache(maxsize=None)
+def _parse_unit(unit: str) -> pint.Quantity:
+    """Parse unit string, cached as parsing with pint is slow."""
+    return ureg[unit]
+
+
 class BoolDecision(Decision):
     """Accepts input convertable as bool"""
 
-    POSITIVES = ("y", "yes", "ja", "j", "1")
-    NEGATIVES = ("n", "no", "nein", "n", "0")
+    POSITIVES = frozenset(("y", "yes", "ja", "j", "1"))
+    NEGATIVES = frozenset(("n", "no", "nein", "0"))
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, validate_func=None, **kwargs)
@@ -428,15 +477,11 @@ class ListDecision(Decision):
         return value in self.items
 
     def get_body(self):
-        body = []
-        for i, item in enumerate(self.choices):
-            if isinstance(item, (list, tuple)) and len(item) == 2:
-                # label provided
-                body.append((i, *item))
-            else:
-                # no label provided
-                body.append((i, item, ' '))
-        return body
+        if hasattr(self, 'labels'):
+            return [(i, item, label) for i, (item, label)
+                    in enumerate(zip(self.items, self.labels))]
+        # no label provided
+        return [(i, item, ' ') for i, item in enumerate(self.items)]
 
 
 class StringDecision(Decision):
@@ -461,7 +506,10 @@ class GuidDecision(Decision):
         if isinstance(value, set) and value:
             if not self.multi and len(value) != 1:
                 return False
-            return all(isinstance(guid, str) and len(guid) == 22 for guid in value)
+            for guid in value:
+                if type(guid) is not str or len(guid) != 22:
+                    return False
+            return True
         return False
 
     def serialize_value(self):
@@ -474,17 +522,31 @@ class GuidDecision(Decision):
 class DecisionBunch(list):
     """Collection of decisions."""
 
+    __slots__ = ()  # no per instance __dict__ needed
+    _solved_states = frozenset((Status.ok, Status.skipped))
+
     def __init__(self, decisions: Iterable[Decision] = ()):
         super().__init__(decisions)
 
     def valid(self) -> bool:
         """Check status of all decisions."""
-        return all(decision.status in (Status.ok, Status.skipped)
-                   for decision in self)
+        solved_states = self._solved_states
+        for decision in self:
+            if decision.status not in solved_states:
+                return False
+        return True
 
     def to_answer_dict(self) -> Dict[Any, Decision]:
-        """Create dict from DecisionBunch using decision.key."""
-        return {decision.key: decision.value for decision in self}
+        """Create dict from DecisionBunch using decision.key.
+
+        Raises:
+            ValueError: if any decision is not valid
+        """
+        if not self.valid():
+            raise ValueError("Can't get value from invalid decision.")
+        # validity is checked once for the whole bunch, so the value
+        # property and its check can be bypassed
+        return {decision.key: decision._value for decision in self}
 
     def to_serializable(self) -> dict:
         """Create JSON serializable dict of decisions."""
@@ -496,9 +558,16 @@ class DecisionBunch(list):
         """Check if all global keys are unique.
 
         :raises: AssertionError on bad keys."""
-        # mapping = {decision.global_key: decision for decision in self}
-        count = Counter(item.global_key for item in self if item.global_key)
-        duplicates = {decision for (decision, v) in count.items() if v > 1}
+        seen = set()
+        duplicates = set()
+        for decision in self:
+            global_key = decision.global_key
+            if not global_key:
+                continue
+            if global_key in seen:
+                duplicates.add(global_key)
+            else:
+                seen.add(global_key)
 
         if duplicates:
             raise AssertionError("Following global keys are not unique: %s",
@@ -536,17 +605,81 @@ class DecisionBunch(list):
         return unique_decisions, doubled_decisions
 
 
+@lru_cache(maxsize=None)
+def _installed_version() -> str:
+    """Return installed bim2sim version.
+
+    The metadata lookup scans sys.path, so it is only done once per process.
+    """
+    return version("bim2sim")
+
+
+def _json_key(key) -> str:
+    """Encode key like json does for dict keys."""
+    if not isinstance(key, str):
+        key = json.dumps(key)
+    return json.dumps(key)
+
+
+def _is_finite(obj) -> bool:
+    """Check obj holds no NaN or infinite floats, which orjson writes as null.
+    """
+    if isinstance(obj, float):
+        return math.isfinite(obj)
+    if isinstance(obj, dict):
+        return all(map(_is_finite, obj.values()))
+    if isinstance(obj, (list, tuple)):
+        return all(map(_is_finite, obj))
+    if hasattr(obj, 'dtype') and hasattr(obj, 'tolist'):
+        # numpy arrays and scalars
+        return _is_finite(obj.tolist())
+    return True
+
+
+def _dumps(obj) -> str:
+    """Encode obj as JSON. Uses orjson if installed, which is much faster.
+
+    Objects with NaN or infinite floats are encoded by json, which keeps them
+    as NaN and Infinity instead of null. Like orjson, json is told not to
+    escape non-ASCII characters, so both write the same output.
+    """
+    if orjson and _is_finite(obj):
+        try:
+            return orjson.dumps(
+                obj, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+        except TypeError:
+            pass  # let json handle or raise on types unknown to orjson
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def _loads(data: bytes):
+    """Decode JSON data. Uses orjson if installed, which is much faster."""
+    if orjson:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # json also accepts e.g. NaN
+    return json.loads(data)
+
+
 def save(bunch: DecisionBunch, path):
-    """Save solved Decisions to file system"""
+    """Save solved Decisions to file system.
 
-    decisions = bunch.to_serializable()
-    data = {
-        'version': version("bim2sim"),
-        'checksum_ifc': None,
-        'decisions': decisions,
-    }
-    with open(path, "w") as file:
-        json.dump(data, file, indent=2)
+    Decisions are encoded one by one instead of building the serializable
+    dict of the whole bunch first. The file is only written after all
+    decisions are encoded, so a failing decision does not leave a truncated
+    file behind. The file is written as UTF-8 bytes independent of the locale,
+    as non-ASCII characters are not escaped.
+    """
+    entries = ',\n'.join(
+        '    %s: %s' % (_json_key(decision.global_key),
+                        _dumps(decision.get_serializable()))
+        for decision in bunch)
+    content = ('{\n  "version": %s,\n  "checksum_ifc": null,\n'
+               '  "decisions": {\n%s\n  }\n}\n' % (
+                   json.dumps(_installed_version()), entries))
+    with open(path, "wb") as file:
+        file.write(content.encode('utf-8'))
     logger.info("Saved %d decisions.", len(bunch))
 
 
@@ -554,18 +687,19 @@ def load(path) -> Dict[str, Any]:
     """Load previously solved Decisions from file system."""
 
     try:
-        with open(path, "r") as file:
-            data = json.load(file)
+        with open(path, "rb") as file:
+            data = _loads(file.read())
     except IOError as ex:
         logger.info(f"Unable to load decisions. "
                     f"No Existing decisions found at {ex.filename}")
         return {}
     cur_version = data.get('version', '0')
-    if cur_version != version("bim2sim"):
+    installed_version = _installed_version()
+    if cur_version != installed_version:
         try:
-            data = convert(cur_version, version("bim2sim"), data)
+            data = convert(cur_version, installed_version, data)
             logger.info("Converted stored decisions from version '%s' to '%s'",
-                        cur_version, version("bim2sim"))
+                        cur_version, installed_version)
         except:
             logger.error("Decision conversion from %s to %s failed")
             return {}
@@ -38,13 +38,12 @@ class ConsoleDecisionHandler(DecisionHandler):
         len_labels = max(len(str(item[2])) for item in body)
         header_str = "  {key:3s}  {label:%ds}  {value:s}" % (len_labels)
         format_str = "\n  {key:3s}  {label:%ds}  {value:s}" % (len_labels)
-        body_txt = header_str.format(key="key", label="label", value="value")
-
-        for key, value, label in body:
-            body_txt += format_str.format(key=str(key), label=str(label),
+        body_txt = [header_str.format(key="key", label="label", value="value")]
+        body_txt.extend(format_str.format(key=str(key), label=str(label),
                                           value=str(value))
+                        for key, value, label in body)
 
-        return body_txt
+        return ''.join(body_txt)
 
     @staticmethod
     def collection_progress(collection):
@@ -94,7 +93,7 @@ class ConsoleDecisionHandler(DecisionHandler):
         identifier = decision.console_identifier
         options = self.get_options(decision)
         if extra_options:
-            options = options + extra_options
+            options = (*options, *extra_options)
         options_txt = self.get_options_txt(options)
         default = self.get_default_txt(decision)
         body = self.get_body(decision) if isinstance(decision, ListDecision) \
@@ -103,16 +102,17 @@ class ConsoleDecisionHandler(DecisionHandler):
         if progress:
             progress += ' '
 
-        print(progress, end='')
-        print(question)
+        # collect all lines to write the prompt at once
+        lines = [progress + question]
         if identifier:
-            print(identifier)
+            lines.append(identifier)
         if isinstance(decision, ListDecision) and decision.live_search:
-            print("enter 'reset' to start search again")
-            print("enter 'back' to return to last search")
-        print(options_txt + ' ' + default)
+            lines.append("enter 'reset' to start search again")
+            lines.append("enter 'back' to return to last search")
+        lines.append(options_txt + ' ' + default)
         if body:
-            print(self.get_body_txt(body))
+            lines.append(self.get_body_txt(body))
+        print('\n'.join(lines))
 
         max_attempts = 10
         attempt = 0
@@ -214,9 +214,8 @@ class ConsoleDecisionHandler(DecisionHandler):
                 default = self.get_default_txt(decision)
                 body = decision.get_body()
                 body_txt = self.get_body_txt(body)
-                print(decision.question)
-                print(options_txt + ' ' + default)
-                print(body_txt)
+                print('\n'.join(
+                    (decision.question, options_txt + ' ' + default, body_txt)))
 
         return value
 
@@ -1,10 +1,11 @@
 
 import logging
 
+logger = logging.getLogger(__name__)
+
 
 def log(name):
     """Decorator for logging of entering and leaving method"""
-    logger = logging.getLogger(__name__)
     def log_decorator(func):
         def wrapper(*args, **kwargs):
             logger.info("Started %s ...", name)
@@ -6,9 +6,10 @@ import logging
 import pkgutil
 import sys
 from abc import ABCMeta
+from functools import lru_cache
 from inspect import isclass
 from pathlib import Path
-from typing import Set, Type, List, TYPE_CHECKING
+from typing import Set, Type, List, Tuple, TYPE_CHECKING
 
 from bim2sim.tasks import common, bps
 from bim2sim.tasks.base import ITask
@@ -21,9 +22,13 @@ logger = logging.getLogger(__name__)
 
 
 def add_plugins_to_path(root: Path):
-    """Add all directories under root to path."""
+    """Add all directories under root holding a plugin package to path.
+
+    Other directories (e.g. __pycache__) are skipped, as every entry in
+    sys.path is searched on each import.
+    """
     for folder in root.glob('*/'):
-        if folder.is_dir():
+        if folder.is_dir() and any(folder.glob('bim2sim_*/__init__.py')):
             sys.path.append(str(folder))
             logger.info("Added %s to path", folder)
 
@@ -74,11 +79,18 @@ class PluginBPSBase(Plugin):
 
 def available_plugins() -> List[str]:
     """List all available plugins."""
-    plugins = []
-    for finder, name, is_pkg in pkgutil.iter_modules():
-        if is_pkg and name.startswith('bim2sim_'):
-            plugins.append(name)
-    return plugins
+    return list(_scan_plugins())
+
+
+@lru_cache(maxsize=None)
+def _scan_plugins() -> Tuple[str, ...]:
+    """Scan sys.path for plugin packages.
+
+    Walking sys.path is expensive, so the result is cached. Call
+    _scan_plugins.cache_clear() after installing plugins at runtime.
+    """
+    return tuple(name for finder, name, is_pkg in pkgutil.iter_modules()
+                 if is_pkg and name.startswith('bim2sim_'))
 
 
 def load_plugin(name: str) -> Type[Plugin]:
@@ -21,6 +21,8 @@ from bim2sim.tasks.base import ITask, Playground
 from bim2sim.utilities.common_functions import all_subclasses
 from bim2sim.utilities.types import IFCDomain
 
+quality_logger = logging.getLogger('bim2sim.QualityReport')
+
 
 class CheckIfc(ITask):
     """
@@ -92,7 +94,6 @@ class CheckIfc(ITask):
                 self.validate_elements, self.elements)
             instance_errors = sum(len(errors) for errors in
                                   self.error_summary_inst.values())
-            quality_logger = logging.getLogger('bim2sim.QualityReport')
             quality_logger.warning(
                 '%d errors were found on %d elements' %
                 (instance_errors, len(self.error_summary_inst)))
@@ -18,6 +18,8 @@ from bim2sim.utilities.types import LOD
 from bim2sim.tasks.base import Playground
 from ifcopenshell import file, entity_instance
 
+quality_logger = logging.getLogger('bim2sim.QualityReport')
+
 
 class CreateElementsOnIfcTypes(ITask):
     """Create bim2sim elements based on information of IFC types."""
@@ -161,7 +163,7 @@ class CreateElementsOnIfcTypes(ITask):
 
         """
         valid, invalid = [], []
-        blacklist = [
+        blacklist = {
             'IfcMaterialLayerSet',
             'IfcMaterialLayer',
             'IfcMaterial',
@@ -169,11 +171,15 @@ class CreateElementsOnIfcTypes(ITask):
             'IfcMaterialConstituent',
             'IfcMaterialProfile',
             'IfcMaterialProfileSet',
-        ]
+        }
 
-        blacklist_classes = [
+        blacklist_classes = {
             bps.LayerSet, bps.Layer, Material
-        ]
+        }
+
+        # TODO #676
+        plugin_name = self.playground.project.plugin_cls.name
+        check_layers = plugin_name in ('EnergyPlus', 'Comfort', 'Teaser')
 
         for entity, ifc_type_or_element_cls in entities_dict.items():
             try:
@@ -194,9 +200,7 @@ class CreateElementsOnIfcTypes(ITask):
             except LookupError:
                 invalid.append(entity)
                 continue
-            # TODO #676
-            plugin_name = self.playground.project.plugin_cls.name
-            if plugin_name in ['EnergyPlus', 'Comfort', 'Teaser']:
+            if check_layers:
                 if (self.playground.sim_settings.layers_and_materials
                         is not LOD.low):
                     raise NotImplementedError(
@@ -240,8 +244,6 @@ class CreateElementsOnIfcTypes(ITask):
         Args:
             element: the already created bim2sim element
         """
-        quality_logger = logging.getLogger(
-            'bim2sim.QualityReport')
         if hasattr(element.ifc, 'HasAssociations'):
             for association in element.ifc.HasAssociations:
                 if association.is_a("IfcRelAssociatesMaterial"):
@@ -522,12 +524,12 @@ class CreateElementsOnIfcTypes(ITask):
         representatives = group_similar_entities(
             sim_settings.group_unidentified, sim_settings.fuzzy_threshold)
 
+        # assert same list of ifc_files
+        checksum = Decision.build_checksum(
+            [pe.key for pe in sorted_elements])
         for ifc_type, repr_entities in sorted(representatives.items()):
             decisions = DecisionBunch()
             for ifc_entity, represented in repr_entities.items():
-                # assert same list of ifc_files
-                checksum = Decision.build_checksum(
-                    [pe.key for pe in sorted_elements])
 
                 best_guess_cls = best_guess_dict.get(ifc_entity)
                 best_guess = best_guess_cls.key if best_guess_cls else None
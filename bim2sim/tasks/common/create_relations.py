@@ -28,6 +28,8 @@ class CreateRelations(ITask):
             elements: dict[guid: element]
         """
         self.logger.info("Creating bim2sim elements relations.")
+        # sets of the members of each relation list for O(1) lookup
+        known_members = {}
         for element in elements.values():
             # connect element to site and vice versa
             ifc_site = getSite(element.ifc)
@@ -35,8 +37,8 @@ class CreateRelations(ITask):
                 element_site = elements.get(
                     ifc_site.GlobalId, None)
                 if isinstance(element, Building):
-                    if element not in element_site.buildings:
-                        element_site.buildings.append(element)
+                    _append_unique(
+                        element_site.buildings, element, known_members)
 
             # connect element to building and vice versa
             ifc_building = getBuilding(element.ifc)
@@ -44,15 +46,15 @@ class CreateRelations(ITask):
                 element_building = elements.get(
                     ifc_building.GlobalId, None)
                 if isinstance(element, Storey):
-                    if element not in element_building.storeys:
-                        element_building.storeys.append(element)
+                    _append_unique(
+                        element_building.storeys, element, known_members)
                 if isinstance(element, ThermalZone):
                     if not isinstance(element, ExternalSpatialElement):
-                        if element not in element_building.thermal_zones:
-                            element_building.thermal_zones.append(element)
+                        _append_unique(element_building.thermal_zones,
+                                       element, known_members)
                 else:
-                    if element not in element_building.elements:
-                        element_building.elements.append(element)
+                    _append_unique(
+                        element_building.elements, element, known_members)
                 element.building = element_building
 
             # connect element to storey and vice versa
@@ -62,12 +64,31 @@ class CreateRelations(ITask):
                     ifc_storey.GlobalId, None)
                 if isinstance(element, ThermalZone):
                     if not isinstance(element, ExternalSpatialElement):
-                        if element not in element_storey.thermal_zones:
-                            element_storey.thermal_zones.append(element)
+                        _append_unique(element_storey.thermal_zones,
+                                       element, known_members)
                 else:
-                    if element not in element_storey.elements:
-                        element_storey.elements.append(element)
+                    _append_unique(
+                        element_storey.elements, element, known_members)
                 if element not in element.storeys:
                     element.storeys.append(element_storey)
             # relations between element and space are handled in sb_creation
             # as more robust
+
+
+def _append_unique(relation_list: list, element, known_members: dict):
+    """Append element to relation list if it is not contained yet.
+
+    Membership is checked against a set of the list members instead of the
+    list itself, which would be quadratic for large buildings.
+
+    Args:
+        relation_list: list of related elements, e.g. building.elements
+        element: element to append
+        known_members: dict of member sets by id of the relation list
+    """
+    members = known_members.get(id(relation_list))
+    if members is None:
+        members = known_members[id(relation_list)] = set(relation_list)
+    if element not in members:
+        members.add(element)
+        relation_list.append(element)
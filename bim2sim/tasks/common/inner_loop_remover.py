@@ -27,6 +27,8 @@ from OCC.Core.gp import gp_Pnt, gp_XYZ
 
 from bim2sim.utilities.pyocc_tools import PyOCCTools
 
+logger = logging.getLogger(__name__)
+
 Vertex = Vector = Tuple[float, float, float]
 Edge = Tuple[Vertex, Vertex]
 Triangulation = List[List[Vertex]]
@@ -585,7 +587,6 @@ def convex_decomposition(shape: TopoDS_Shape,
                     ((new_normal - org_normal).Coord())]):
                 oriented_shapes.append(new_shape)
             else:
-                logger = logging.getLogger(__name__)
                 logger.error(
                     "Convex decomposition produces a gap in new space boundary")
     # check if decomposed shape has same area as original shape
@@ -613,7 +614,6 @@ def convex_decomposition(shape: TopoDS_Shape,
             oriented_area += cut_area
             add_cut_shapes.append(cs)
         if cut_count > 3:
-            logger = logging.getLogger(__name__)
             logger.error(
                 "Convex decomposition produces a gap in new space boundary")
             break
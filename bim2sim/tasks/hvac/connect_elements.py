@@ -46,6 +46,10 @@ class ConnectElements(ITask):
         """
         self.logger.info("Connect elements")
 
+        # Calculate all port positions at once
+        hvac.calc_port_positions(
+            [port for item in elements.values() for port in item.ports
+             if isinstance(port, hvac.HVACPort)])
         # Check ports
         self.logger.info("Checking ports of elements ...")
         self.check_element_ports(elements)
@@ -267,15 +271,26 @@ class ConnectElements(ITask):
             list of tuples of ports that are connected.
         """
         graph = nx.Graph()
-        for port1, port2 in itertools.combinations(ports, 2):
-            if port1.parent == port2.parent:
-                continue
-            delta = ConnectElements.port_distance(port1, port2)
-            if delta is None:
+        # gather positions into one array to compare each port against all
+        # following ports at once
+        located_ports = []
+        positions = []
+        for port in ports:
+            try:
+                position = port.position
+            except AttributeError:
                 continue
-            abs_delta = max(abs(delta))
-            if abs_delta < eps:
-                graph.add_edge(port1, port2, delta=abs_delta)
+            if position is not None:
+                located_ports.append(port)
+                positions.append(position)
+        positions = np.asarray(positions, dtype=float)
+        for i, port1 in enumerate(located_ports[:-1]):
+            abs_deltas = np.abs(positions[i + 1:] - positions[i]).max(axis=1)
+            for j in np.flatnonzero(abs_deltas < eps):
+                port2 = located_ports[i + 1 + j]
+                if port1.parent == port2.parent:
+                    continue
+                graph.add_edge(port1, port2, delta=abs_deltas[j])
 
         # verify
         conflicts = [port for port, deg in graph.degree() if deg > 1]
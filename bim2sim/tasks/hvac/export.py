@@ -39,8 +39,7 @@ class Export(ITask):
         connections = graph.get_connections()
 
         modelica.ModelicaElement.init_factory(libraries)
-        export_elements = {inst: modelica.ModelicaElement.factory(inst)
-                           for inst in elements}
+        export_elements = modelica.ModelicaElement.factory_many(elements)
 
         # Perform decisions for requested but not existing attributes
         yield from ProductBased.get_pending_attribute_decisions(elements)
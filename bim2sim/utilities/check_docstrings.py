@@ -52,9 +52,10 @@ def generate_markdown_table(data):
     return table
 
 
-# run the function against current bim2sim repository
-functions_with_docstrings, structured_messages = count_functions_with_correct_docstrings(Path(bim2sim.__file__).parent)
-markdown_table = generate_markdown_table(structured_messages)
-print(f'Number of cuntions with Docstrings: {functions_with_docstrings}')
+if __name__ == '__main__':
+    # run the function against current bim2sim repository
+    functions_with_docstrings, structured_messages = count_functions_with_correct_docstrings(Path(bim2sim.__file__).parent)
+    markdown_table = generate_markdown_table(structured_messages)
+    print(f'Number of cuntions with Docstrings: {functions_with_docstrings}')
 
-print(markdown_table)
+    print(markdown_table)
@@ -69,43 +69,46 @@ def validateJSON(json_data: Union[str, Path,]):
     return True
 
 
+def load_json(json_path: Union[str, Path]) -> dict:
+    """Load json file.
+
+    The file is parsed only once, instead of validating it with
+    validateJSON() first and loading it afterwards.
+
+    Raises:
+        ValueError: if the file holds invalid JSON
+    """
+    try:
+        with open(json_path, 'rb') as file:
+            return json.load(file)
+    except ValueError:
+        raise ValueError(f"Invalid JSON file {json_path}")
+
+
 def get_use_conditions_dict(custom_use_cond_path: Path) -> dict:
     if custom_use_cond_path:
         if custom_use_cond_path.is_file():
             use_cond_path = custom_use_cond_path
     else:
         use_cond_path = assets / 'enrichment/usage/UseConditions.json'
-    if validateJSON(use_cond_path):
-        with open(use_cond_path, 'r+', encoding='utf-8') as file:
-            use_cond_dict = json.load(file)
-            del use_cond_dict['version']
-            return use_cond_dict
-    else:
-        raise ValueError(f"Invalid JSON file {use_cond_path}")
+    use_cond_dict = load_json(use_cond_path)
+    del use_cond_dict['version']
+    return use_cond_dict
 
 
 def get_common_pattern_usage() -> dict:
     common_pattern_path = assets / 'enrichment/usage/commonUsages.json'
-    if validateJSON(common_pattern_path):
-        with open(common_pattern_path, 'r+', encoding='utf-8') as file:
-            common_usages = json.load(file)
-            return common_usages
-    else:
-        raise ValueError(f"Invalid JSON file  {common_pattern_path}")
+    return load_json(common_pattern_path)
 
 
 def get_custom_pattern_usage(custom_usages_path: Path) -> dict:
     """gets custom usages based on given json file."""
     custom_usages = {}
     if custom_usages_path and custom_usages_path.is_file():
-        if validateJSON(custom_usages_path):
-            with open(custom_usages_path, 'r+', encoding='utf-8') as file:
-                custom_usages_json = json.load(file)
-                if custom_usages_json["settings"]["use"]:
-                    custom_usages = custom_usages_json["usage_definitions"]
-                return custom_usages
-        else:
-            raise ValueError(f"Invalid JSON file  {custom_usages_path}")
+        custom_usages_json = load_json(custom_usages_path)
+        if custom_usages_json["settings"]["use"]:
+            custom_usages = custom_usages_json["usage_definitions"]
+        return custom_usages
 
 
 def get_pattern_usage(use_conditions: dict, custom_usages_path: Path):
@@ -219,33 +222,21 @@ def wildcard_match(pattern, text):
 def get_type_building_elements():
     type_building_elements_path = \
         assets / 'enrichment/material/TypeBuildingElements.json'
-    if validateJSON(type_building_elements_path):
-        with open(type_building_elements_path, 'r+') as file:
-            type_building_elements = json.load(file)
-            del type_building_elements['version']
-    else:
-        raise ValueError(f"Invalid JSON file  {type_building_elements_path}")
+    type_building_elements = load_json(type_building_elements_path)
+    del type_building_elements['version']
     template_options = {}
-    for i in type_building_elements:
+    for i, template in type_building_elements.items():
         i_name, i_years, i_template = i.split('_')
-        if i_name not in template_options:
-            template_options[i_name] = {}
-        if i_years not in template_options[i_name]:
-            template_options[i_name][i_years] = {}
-        template_options[i_name][i_years][i_template] = type_building_elements[
-            i]
+        template_options.setdefault(i_name, {}).setdefault(
+            i_years, {})[i_template] = template
     return template_options
 
 
 def get_material_templates():
     material_templates_path = \
         assets / 'enrichment/material/MaterialTemplates.json'
-    if validateJSON(material_templates_path):
-        with open(material_templates_path, 'r+') as f:
-            material_templates = json.load(f)
-            del material_templates['version']
-    else:
-        raise ValueError(f"Invalid JSON file  {material_templates_path}")
+    material_templates = load_json(material_templates_path)
+    del material_templates['version']
     return material_templates
 
 
@@ -253,12 +244,8 @@ def get_type_building_elements_hvac():
     # todo: still needed?
     type_building_elements_path = \
         assets / 'enrichment/hvac/TypeHVACElements.json'
-    if validateJSON(type_building_elements_path):
-        with open(type_building_elements_path, 'r+') as file:
-            type_building_elements = json.load(file)
-            del type_building_elements['version']
-    else:
-        raise ValueError(f"Invalid JSON file  {type_building_elements_path}")
+    type_building_elements = load_json(type_building_elements_path)
+    del type_building_elements['version']
     return type_building_elements
 
 
@@ -1,8 +1,11 @@
 import unittest
+from types import SimpleNamespace
 
 import bim2sim.elements.aggregation.hvac_aggregations
 from bim2sim.elements import aggregation
 from bim2sim.elements import hvac_elements as hvac
+from bim2sim.elements.aggregation.hvac_aggregations import PipeStrand, \
+    length_weighted_diameter
 from bim2sim.elements.graphs.hvac_graph import HvacGraph
 from bim2sim.elements.mapping.units import ureg
 from test.unit.elements.helper import SetupHelperHVAC
@@ -404,6 +407,68 @@ class TestPipeStrand(unittest.TestCase):
         edge_ports = [edge_port.originals[0] for edge_port in agg.get_ports()]
         self.assertEqual(set(flags['edge_ports']), set(edge_ports))
 
+    def test_get_edge_ports_in_system(self):
+        """ Test the get_edge_ports method for a strand inside a system."""
+        graph, flags = self.helper.get_setup_simple_boiler()
+        strand = flags['strand1']
+        match = graph.subgraph_from_elements(strand)
+        agg = bim2sim.elements.aggregation.hvac_aggregations.PipeStrand(
+            graph, match)
+        edge_ports = {edge_port.originals[0]
+                      for edge_port in agg.get_ports()}
+
+        self.assertEqual({strand[0].ports[0], strand[-1].ports[-1]},
+                         edge_ports)
+        # former lookup by differences of the edge sets
+        outer_edges = graph.subgraph(graph.nodes - match.nodes).edges
+        related_edges = graph.edges - outer_edges - match.edges
+        self.assertEqual(
+            {port for edge in related_edges for port in edge
+             if port in match},
+            edge_ports)
+
+
+
+class TestLengthWeightedDiameter(unittest.TestCase):
+
+    def test_weighted_average(self):
+        """Test total length and length weighted average diameter"""
+        total_length, avg_diameter = length_weighted_diameter([
+            (1 * ureg.meter, 30 * ureg.millimeter),
+            (3 * ureg.meter, 50 * ureg.millimeter)])
+        self.assertAlmostEqual(4 * ureg.meter, total_length)
+        self.assertAlmostEqual(45 * ureg.millimeter, avg_diameter)
+
+    def test_mixed_units(self):
+        """Test lengths and diameters given in different units"""
+        total_length, avg_diameter = length_weighted_diameter([
+            (1 * ureg.meter, 30 * ureg.millimeter),
+            (100 * ureg.centimeter, 5 * ureg.centimeter),
+            (2000 * ureg.millimeter, 0.04 * ureg.meter)])
+        self.assertAlmostEqual(4 * ureg.meter, total_length)
+        self.assertAlmostEqual(40 * ureg.millimeter, avg_diameter)
+
+    def test_zero_length(self):
+        """Test zero total length gives no average diameter"""
+        total_length, avg_diameter = length_weighted_diameter(
+            [(0 * ureg.meter, 30 * ureg.millimeter)])
+        self.assertEqual(0 * ureg.meter, total_length)
+        self.assertEqual(0, avg_diameter)
+        self.assertEqual((0, 0), length_weighted_diameter([]))
+
+    def test_missing_diameter(self):
+        """Test PipeStrand ignores elements without diameter"""
+        elements = [
+            SimpleNamespace(length=2 * ureg.meter,
+                            diameter=30 * ureg.millimeter),
+            SimpleNamespace(length=1 * ureg.meter, diameter=None),
+            SimpleNamespace(length=None, diameter=20 * ureg.millimeter)]
+        strand = SimpleNamespace(elements=elements, attributes={})
+        length = PipeStrand._calc_avg(strand, 'length')
+        self.assertAlmostEqual(2 * ureg.meter, length)
+        self.assertAlmostEqual(
+            30 * ureg.millimeter, strand.attributes['diameter'])
+
 
 if __name__ == '__main__':
     unittest.main()
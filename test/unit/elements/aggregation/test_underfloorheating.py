@@ -6,6 +6,7 @@ import numpy as np
 import bim2sim.elements.aggregation.hvac_aggregations
 from bim2sim.elements import aggregation
 from bim2sim.elements import hvac_elements as hvac
+from bim2sim.elements.aggregation.hvac_aggregations import UnderfloorHeating
 from bim2sim.elements.graphs.hvac_graph import HvacGraph
 from bim2sim.elements.mapping.units import ureg
 from test.unit.elements.helper import SetupHelperHVAC
@@ -42,6 +43,28 @@ class UFHHelper(SetupHelperHVAC):
         graph = HvacGraph(gen_circuit)
         return graph, flags
 
+    def get_setup_ufh2(self):
+        """
+        Small underfloorheating of three pipes parallel to x-axis, 1 m long
+        and 0.5 m apart, connected by two pipes parallel to y-axis
+        """
+        flags = {}
+
+        x_dimension = 1 * ureg.meter
+        spacing = 0.5 * ureg.meter
+        with self.flag_manager(flags):
+            y_pipes = [self.element_generator(
+                hvac.Pipe, length=spacing,
+                diameter=20 * ureg.millimeter) for i in range(2)]
+            x_pipes = [self.element_generator(
+                hvac.Pipe, length=x_dimension,
+                diameter=15 * ureg.millimeter) for i in range(3)]
+        # connect
+        ufh_strand = self.connect_ufh(x_pipes, y_pipes, x_dimension, spacing)
+        flags['strand'] = ufh_strand
+        graph = HvacGraph(ufh_strand)
+        return graph, flags
+
     @classmethod
     def connect_ufh(cls, x_pipes, y_pipes, x_dimension, spacing):
         """
@@ -123,6 +146,35 @@ class TestUnderfloorHeating(unittest.TestCase):
         self.assertAlmostEqual(.2 * ureg.meter, agg.y_spacing, 1)
         self.assertAlmostEqual(.24 * ureg.meter, agg.x_spacing, 2)
 
+    def test_pipe_strand_attributes(self):
+        """ Test attributes of a small known underfloor heating strand."""
+        graph, flags = self.helper.get_setup_ufh2()
+        chain = flags['strand']
+        ports_coors = np.array(
+            [port.position for element in chain for port in element.ports])
+
+        heating_area, total_length, avg_diameter, dist_x, dist_y = \
+            UnderfloorHeating.get_pipe_strand_attributes(ports_coors, chain)
+
+        self.assertAlmostEqual(4 * ureg.meter, total_length)
+        # sqrt((3 * 1 m * (15 mm)^2 + 2 * 0.5 m * (20 mm)^2) / 4 m)
+        self.assertAlmostEqual(
+            math.sqrt(268.75) * ureg.millimeter, avg_diameter)
+        self.assertAlmostEqual(1 * ureg.meter, dist_x)
+        self.assertAlmostEqual(1 * ureg.meter, dist_y)
+        self.assertAlmostEqual(1 * ureg.meter ** 2, heating_area)
+
+    def test_pipe_strand_spacing(self):
+        """ Test spacing of a small known underfloor heating strand."""
+        graph, flags = self.helper.get_setup_ufh2()
+
+        x_spacing, y_spacing = UnderfloorHeating.get_pipe_strand_spacing(
+            flags['strand'], 1 * ureg.meter, 1 * ureg.meter, tolerance=2)
+
+        # three pipes at 0 degree and two pipes at 90 degree
+        self.assertAlmostEqual(0.5 * ureg.meter, x_spacing)
+        self.assertAlmostEqual(1 * ureg.meter, y_spacing)
+
 
 if __name__ == '__main__':
     unittest.main()
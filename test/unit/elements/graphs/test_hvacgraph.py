@@ -163,6 +163,24 @@ class TestHVACGraph(unittest.TestCase):
             graph.element_graph, strait[0], strait[-1])
         self.assertIn(replacement, path_element)
 
+    def test_contract_ports(self):
+        """ Test contracting ports into their elements."""
+        strait = generate_element_strait()
+        graph = hvac_graph.HvacGraph(strait)
+        contracted = hvac_graph.HvacGraph._contract_ports_into_elements(
+            graph, list(graph.nodes))
+
+        self.assertSetEqual(set(contracted.nodes), set(strait))
+        self.assertEqual(contracted.number_of_edges(), len(strait) - 1)
+        for ele in strait:
+            self.assertSetEqual(
+                set(contracted.get_contractions(ele)),
+                {port for port in ele.ports if port in graph})
+        self.assertSetEqual(
+            set(hvac_graph.HvacGraph.get_not_contracted_neighbors(
+                contracted, strait[2])),
+            {strait[1], strait[3]})
+
     def test_type_chain(self):
         """ Test chain detection."""
         elements, flags = self.helper.get_system_elements()
@@ -1,10 +1,23 @@
 ﻿"""Testing classes of module element"""
 
+import re
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+
+import ifcopenshell
+import numpy as np
+from ifcopenshell import guid
+
+try:
+    import numba
+except ImportError:
+    numba = None
 
 from bim2sim.elements import hvac_elements as hvac
-from bim2sim.elements.base_elements import ProductBased, Factory
+from bim2sim.elements.aggregation.hvac_aggregations import HVACAggregationPort
+from bim2sim.elements.base_elements import ProductBased, Factory, IFCBased, \
+    _pattern_matcher
 from bim2sim.elements.mapping.attribute import Attribute
 from bim2sim.elements.mapping.ifc2python import load_ifc
 from test.unit.elements.helper import SetupHelperHVAC
@@ -65,6 +78,29 @@ class TestProductBased(unittest.TestCase):
         self.assertIsInstance(item, ProductBased)
         self.assertEqual(guid, item.guid)
 
+    def test_type_propertysets_per_element(self):
+        """Test type propertysets are cached per file but not shared."""
+        ifc = ifcopenshell.file(schema='IFC4')
+        prop = ifc.createIfcPropertySingleValue(
+            'Description', None, ifc.createIfcLabel('type value'), None)
+        pset = ifc.createIfcPropertySet(
+            guid.new(), None, 'Pset_Test', None, [prop])
+        pipe_type = ifc.createIfcPipeSegmentType(
+            guid.new(), HasPropertySets=[pset],
+            PredefinedType='RIGIDSEGMENT')
+        pipes = [ifc.createIfcPipeSegment(guid.new()) for _ in range(2)]
+        ifc.createIfcRelDefinesByType(
+            guid.new(), None, None, None, pipes, pipe_type)
+        ifc_units = {}
+        item1, item2 = (Element1.from_ifc(pipe, ifc_units=ifc_units)
+                        for pipe in pipes)
+
+        item1.get_type_propertysets()['Pset_Test']['Description'] = 'changed'
+        self.assertEqual(
+            {'Pset_Test': {'Description': 'type value'}},
+            item2.get_type_propertysets())
+        self.assertIn(ifc, IFCBased._type_propertysets_cache)
+
     def test_validate_creation_two_port_pipe(self):
         helper = SetupHelperHVAC()
         two_port_pipe = helper.element_generator(hvac.Pipe,
@@ -129,5 +165,119 @@ class TestFactory(unittest.TestCase):
         self.assertIs(factory.get_element('IfcSlab', 'ROOF'), TestRoof)
 
 
+def fake_placement(location, ref_direction=None, axis=None):
+    """Minimal stand-in for an IfcObjectPlacement"""
+    relative_placement = SimpleNamespace(
+        Location=SimpleNamespace(Coordinates=location))
+    if ref_direction is not None:
+        relative_placement.RefDirection = SimpleNamespace(
+            DirectionRatios=ref_direction)
+        relative_placement.Axis = SimpleNamespace(DirectionRatios=axis)
+    return SimpleNamespace(
+        ObjectPlacement=SimpleNamespace(RelativePlacement=relative_placement))
+
+
+class TestPatternMatcher(unittest.TestCase):
+
+    def test_scoped_flags(self):
+        """Test flags of compiled patterns apply only to their own group"""
+        patterns = (re.compile(r'\w+ ascii', re.ASCII),
+                    re.compile('CASE', re.IGNORECASE),
+                    'plain')
+        match = _pattern_matcher(patterns)
+        for value, group in (('word ascii', 'g0'), ('case', 'g1'),
+                             ('plain', 'g2')):
+            self.assertEqual(match(value).lastgroup, group)
+        self.assertIsNone(match('wörd ascii'))
+        self.assertIsNone(match('PLAIN'))
+
+    def test_verbose_trailing_comment(self):
+        """Test a trailing comment of a verbose pattern ends at its group"""
+        patterns = (re.compile(r'heat \s pump  # comment', re.VERBOSE),
+                    'plain')
+        match = _pattern_matcher(patterns)
+        self.assertEqual(match('heat pump').lastgroup, 'g0')
+        self.assertEqual(match('plain').lastgroup, 'g1')
+
+    def test_empty(self):
+        """Test no patterns match nothing"""
+        match = _pattern_matcher(())
+        self.assertIsNone(match('any'))
+        self.assertIsNone(match(''))
+
+    def test_global_inline_flag(self):
+        """Test global inline flags apply only to their own pattern"""
+        match = _pattern_matcher(('(?i)abc', 'plain'))
+        self.assertEqual(match('ABC').group(), 'ABC')
+        self.assertEqual(match('plain').group(), 'plain')
+        self.assertIsNone(match('PLAIN'))
+
+    def test_backreference(self):
+        """Test numbered backreferences refer to their own pattern"""
+        match = _pattern_matcher(('x', r'(a)\1'))
+        self.assertEqual(match('aa').group(), 'aa')
+        self.assertIsNone(match('ab'))
+
+    def test_duplicate_group_names(self):
+        """Test patterns may use the same group names"""
+        match = _pattern_matcher(
+            (r'(?P<name>heat)\w*', r'(?P<name>cool)\w*'))
+        self.assertEqual(match('heating').group('name'), 'heat')
+        self.assertEqual(match('cooling').group('name'), 'cool')
+        self.assertIsNone(match('pump'))
+
+
+class TestPortPositions(unittest.TestCase):
+
+    def test_calc_port_positions(self):
+        """Test batch calculation against HVACPort.calc_position"""
+        helper = SetupHelperHVAC()
+        rotated = helper.element_generator(hvac.Pipe)
+        rotated.ifc = fake_placement((0, 0, 0), (0, 1, 0), (0, 0, 1))
+        rotated.__dict__['position'] = np.array([1., 2., 3.])
+        plain = helper.element_generator(hvac.Pipe)
+        plain.ifc = None
+        plain.__dict__['position'] = np.array([-5., 0., 0.])
+        ports = rotated.ports + plain.ports
+        for i, port in enumerate(ports):
+            port.ifc = fake_placement((i, 2 * i, 3))
+
+        hvac.calc_port_positions(ports)
+
+        for port in ports:
+            self.assertIn('position', port.__dict__)
+            np.testing.assert_allclose(port.position, port.calc_position())
+
+    def test_calc_port_positions_skips_overridden(self):
+        """Test batch calculation keeps calc_position overrides of subclasses"""
+        helper = SetupHelperHVAC()
+        original = helper.element_generator(hvac.Pipe)
+        aggregation = helper.element_generator(hvac.Pipe)
+        aggregation.ifc = None
+        aggregation.__dict__['position'] = np.array([-5., 0., 0.])
+        port = HVACAggregationPort(original.ports[0], parent=aggregation)
+        port.ifc = fake_placement((1, 0, 0))
+
+        hvac.calc_port_positions([port])
+
+        self.assertNotIn('position', port.__dict__)
+
+    @unittest.skipIf(numba is None, "numba is not installed")
+    def test_port_position_compiled(self):
+        """Test numba compiled _port_position against the python version"""
+        compiled_func = hvac._port_position
+        self.assertIsInstance(compiled_func, numba.core.dispatcher.Dispatcher)
+        python_func = compiled_func.py_func
+        parent_position = np.array([1., -2., 3.5])
+        location = (0.5, 2., -1.)
+        for x_direction, z_direction in (
+                ((0., 1., 0.), (0., 0., 1.)),
+                ((0.6, 0.8, 0.), (0., 0., -1.)),
+                (hvac._X_DIRECTION, hvac._Z_DIRECTION)):
+            args = (*x_direction, *z_direction, *location, parent_position)
+            np.testing.assert_allclose(
+                compiled_func(*args), python_func(*args))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,6 @@
 ﻿"""Test for decision.py"""
 import json
+import math
 import os
 import tempfile
 import unittest
@@ -111,6 +112,106 @@ class TestDecision(DecisionTestBase):
         self.assertEqual(dec_real.value, 5)
         self.assertFalse(dec_bool.value)
 
+    def test_save_load_non_finite(self):
+        """test NaN and infinite values survive saving and loading"""
+        dec_nan = RealDecision(question="??", global_key="key_nan")
+        dec_nan.value = float('nan')
+        dec_inf = RealDecision(question="??", global_key="key_inf")
+        dec_inf.value = float('inf')
+        decisions = DecisionBunch((dec_nan, dec_inf))
+        with tempfile.TemporaryDirectory(prefix='bim2sim_') as directory:
+            path = os.path.join(directory, "non_finite")
+            save(decisions, path)
+            dec_nan.reset()
+            dec_inf.reset()
+            loaded_decisions = load(path)
+
+        dec_nan.reset_from_deserialized(loaded_decisions["key_nan"])
+        dec_inf.reset_from_deserialized(loaded_decisions["key_inf"])
+        self.assertTrue(math.isnan(dec_nan.value))
+        self.assertEqual(float('inf'), dec_inf.value)
+
+    def test_save_load_non_ascii(self):
+        """test non-ASCII values survive saving and loading, with and without
+        orjson"""
+        for fast_json in (decision.orjson, None):
+            with self.subTest(orjson=fast_json):
+                dec_str = decision.StringDecision(
+                    question="??", global_key="key_str")
+                dec_str.value = "Heizkörper"
+                decisions = DecisionBunch((dec_str,))
+                with patch.object(decision, 'orjson', fast_json), \
+                        tempfile.TemporaryDirectory(
+                            prefix='bim2sim_') as directory:
+                    path = os.path.join(directory, "non_ascii")
+                    save(decisions, path)
+                    with open(path, "rb") as file:
+                        content = file.read()
+                    self.assertIn("Heizkörper".encode('utf-8'), content)
+                    dec_str.reset()
+                    loaded_decisions = load(path)
+
+                dec_str.reset_from_deserialized(loaded_decisions["key_str"])
+                self.assertEqual("Heizkörper", dec_str.value)
+
+    def test_save_failure_keeps_file(self):
+        """test a failing save does not corrupt previously saved decisions"""
+        dec_bool = BoolDecision(question="??", global_key="key_bool")
+        dec_bool.value = True
+        dec_real = RealDecision(question="??", global_key="key_real")
+        dec_real.value = 5.
+        decisions = DecisionBunch((dec_bool, dec_real))
+        with tempfile.TemporaryDirectory(prefix='bim2sim_') as directory:
+            path = os.path.join(directory, "decisions")
+            save(decisions, path)
+            with patch.object(dec_real, 'get_serializable',
+                              side_effect=TypeError("not serializable")):
+                with self.assertRaises(TypeError):
+                    save(decisions, path)
+            loaded_decisions = load(path)
+
+        self.assertEqual({"key_bool", "key_real"}, set(loaded_decisions))
+
+    def test_build_checksum(self):
+        """test checksums are stable and distinguish equal but other typed
+        values"""
+        item = {'b': [1, 2.5, 'c'], 'a': True}
+        checksum = decision.Decision.build_checksum(item)
+        self.assertEqual(checksum, decision.Decision.build_checksum(
+            {'a': True, 'b': [1, 2.5, 'c']}))
+        self.assertEqual(checksum, decision.Decision.build_checksum(item))
+        self.assertNotEqual(checksum, decision.Decision.build_checksum(
+            {'b': [1, 2.5, 'c'], 'a': 1}))
+        self.assertNotEqual(
+            decision.Decision.build_checksum(['a', 'b']),
+            decision.Decision.build_checksum({'a': 'b'}))
+
+    def test_validate_global_keys(self):
+        """test detection of non unique global keys"""
+        bunch = DecisionBunch([
+            BoolDecision(question="??", global_key='key1'),
+            BoolDecision(question="??", global_key='key2'),
+            BoolDecision(question="??"),
+            BoolDecision(question="??"),
+        ])
+        bunch.validate_global_keys()
+
+        bunch.append(BoolDecision(question="??", global_key='key1'))
+        with self.assertRaises(AssertionError):
+            bunch.validate_global_keys()
+
+    def test_to_answer_dict(self):
+        """test answer dict of valid and invalid bunches"""
+        dec_1 = BoolDecision(key='key1', question="??")
+        dec_2 = BoolDecision(key='key2', question="??", allow_skip=True)
+        bunch = DecisionBunch([dec_1, dec_2])
+        dec_1.value = True
+        with self.assertRaises(ValueError):
+            bunch.to_answer_dict()
+        dec_2.skip()
+        self.assertDictEqual({'key1': True, 'key2': None},
+                             bunch.to_answer_dict())
+
     def test_decision_reduce_by_key(self):
         """tests the get_reduced_bunch function with same keys."""
         dec_1 = BoolDecision(key='key1', question="??")
@@ -274,6 +375,17 @@ class TestListDecision(DecisionTestBase):
         self.assertFalse(dec.validate(1))
         self.assertFalse(dec.validate(3))
 
+    def test_body(self):
+        """test body with and without labels"""
+        dec = decision.ListDecision("??", choices=self.choices)
+        self.assertListEqual(
+            [(0, 'a', 'option1'), (1, 'b', 'option2'), (2, 'c', 'option3')],
+            dec.get_body())
+
+        dec_no_labels = decision.ListDecision("??", choices=['a', 'b'])
+        self.assertListEqual(
+            [(0, 'a', ' '), (1, 'b', ' ')], dec_no_labels.get_body())
+
     def test_save_load(self):
         """test saving decisions an loading them"""
         key = "key1"
@@ -1,8 +1,10 @@
+import itertools
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock
 
+import networkx as nx
 import numpy as np
 
 import bim2sim.tasks.common.create_elements
@@ -127,6 +129,30 @@ class TestInspectMethods(unittest.TestCase):
             parent.ports.append(port)
         return parent
 
+    @staticmethod
+    def pairwise_connections_by_position(ports, eps=10):
+        """Former pairwise implementation of connections_by_position"""
+        graph = nx.Graph()
+        for port1, port2 in itertools.combinations(ports, 2):
+            if port1.parent == port2.parent:
+                continue
+            delta = ConnectElements.port_distance(port1, port2)
+            if delta is None:
+                continue
+            abs_delta = max(abs(delta))
+            if abs_delta < eps:
+                graph.add_edge(port1, port2, delta=abs_delta)
+        conflicts = [port for port, deg in graph.degree() if deg > 1]
+        for port in conflicts:
+            candidates = sorted(graph.edges(port, data=True),
+                                key=lambda t: t[2].get('delta', eps))
+            if len(candidates) <= 1:
+                continue
+            first = int(candidates[0][2]['delta'] < candidates[1][2]['delta'])
+            for cand in candidates[first:]:
+                graph.remove_edge(cand[0], cand[1])
+        return list(graph.edges())
+
     def test_connect_by_position(self):
         """Test Inspect.connect_by_position by various scenarios"""
         parent1 = self.create_element([[0, 0, 0], [0, 0, 20]])
@@ -166,3 +192,57 @@ class TestInspectMethods(unittest.TestCase):
                          "Only one connection per port allowed")
         self.assertSetEqual(
             {parent1.ports[1], parent2.ports[0]}, set(connections[0]))
+
+    def test_connect_by_position_exactly_eps(self):
+        """Test ports exactly eps apart are not connected"""
+        parent1 = self.create_element([[0, 0, 0]])
+        parent2 = self.create_element([[0, 0, 10]])
+        parent3 = self.create_element([[0, 0, -9.5]])
+        connections = ConnectElements.connections_by_position(
+            parent1.ports + parent2.ports, eps=10)
+        self.assertEqual([], connections)
+        connections = ConnectElements.connections_by_position(
+            parent1.ports + parent2.ports + parent3.ports, eps=10)
+        self.assertEqual(1, len(connections))
+        self.assertSetEqual(
+            {parent1.ports[0], parent3.ports[0]}, set(connections[0]))
+
+    def test_connect_by_position_several_in_range(self):
+        """Test a port in range of several others keeps only the closest"""
+        center = self.create_element([[0, 0, 0]])
+        close = self.create_element([[0, 0, 2]])
+        far = self.create_element([[0, 5, 0]])
+        tie = self.create_element([[0, 0, -2]])
+        connections = ConnectElements.connections_by_position(
+            center.ports + close.ports + far.ports, eps=10)
+        self.assertEqual(1, len(connections))
+        self.assertSetEqual(
+            {center.ports[0], close.ports[0]}, set(connections[0]))
+        # no connection if the closest candidates are equally close
+        connections = ConnectElements.connections_by_position(
+            center.ports + close.ports + tie.ports, eps=3)
+        self.assertEqual([], connections)
+
+    def test_connect_by_position_same_parent(self):
+        """Test ports of the same parent are skipped but others still match"""
+        parent1 = self.create_element([[0, 0, 0], [0, 0, 1]])
+        parent2 = self.create_element([[0, 0, 30]])
+        parent3 = self.create_element([[0, 0, 31]])
+        connections = ConnectElements.connections_by_position(
+            parent1.ports + parent2.ports + parent3.ports, eps=10)
+        self.assertEqual(1, len(connections))
+        self.assertSetEqual(
+            {parent2.ports[0], parent3.ports[0]}, set(connections[0]))
+
+    def test_connect_by_position_as_pairwise(self):
+        """Test connect_by_position matches the former pairwise version"""
+        rng = np.random.default_rng(42)
+        for _ in range(20):
+            elements = [
+                self.create_element(rng.integers(0, 40, size=(
+                    rng.integers(1, 4), 3)).tolist())
+                for _ in range(15)]
+            ports = [port for element in elements for port in element.ports]
+            self.assertEqual(
+                self.pairwise_connections_by_position(ports, eps=10),
+                ConnectElements.connections_by_position(ports, eps=10))